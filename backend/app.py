@@ -1,7 +1,22 @@
 from flask import Flask, request, jsonify
 from flask_cors import CORS
-import os
-import json
+import threading
+import time
+from collections import OrderedDict
+
+# Optional-import safe: PDF/DOCX parsers are loaded lazily inside the module
+from models.resume_text_extractor import (
+    DocumentError,
+    DocumentTooLargeError,
+    bound_text,
+    extract_text_bounded,
+    get_extraction_stats,
+    read_upload_bytes,
+)
+from models.extraction_pool import ExtractionBusyError, get_default_pool
+from models.database import UserStore
+from services.singleflight import get_singleflight_stats
+from services.stage_graph import get_background_stats, run_in_background, run_stage_graph
 
 # --------------------------------------------------
 # SAFE PLACEHOLDERS (NO HEAVY IMPORTS)
@@ -13,6 +28,20 @@ def extract_text(file):
     except:
         return ""
 
+def extract_resume_text(file):
+    """
+    Size-bounded resume text, falling back to a raw decode when the parsers are unavailable.
+    Unsupported, malformed or oversized documents raise DocumentError.
+    """
+    try:
+        pool = get_default_pool()
+        if pool is not None:
+            return pool.extract(read_upload_bytes(file), file.filename)
+        return extract_text_bounded(file)
+    except ImportError:
+        file.stream.seek(0)
+        return bound_text(extract_text(file))
+
 def extract_resume_with_llama(*args, **kwargs):
     return {
         "skills": ["Python", "Flask", "React"],
@@ -63,6 +92,10 @@ class GoogleSearchAPI:
 app = Flask(__name__)
 CORS(app)
 
+# Credentials live in SQLite; users.json is imported once on startup
+user_store = UserStore()
+user_store.migrate_from_json("users.json")
+
 # --------------------------------------------------
 # AUTH
 # --------------------------------------------------
@@ -77,19 +110,9 @@ def register():
     if not email or not password:
         return jsonify({"error": "Email & password required"}), 400
 
-    users = {}
-    if os.path.exists("users.json"):
-        with open("users.json") as f:
-            users = json.load(f)
-
-    if email in users:
+    if not user_store.add_user(email, password, name):
         return jsonify({"error": "User exists"}), 400
 
-    users[email] = {"password": password, "name": name}
-
-    with open("users.json", "w") as f:
-        json.dump(users, f, indent=2)
-
     return jsonify({"message": "Registered"}), 201
 
 
@@ -99,16 +122,11 @@ def login():
     email = data.get("email")
     password = data.get("password")
 
-    if not os.path.exists("users.json"):
+    user = user_store.get_user(email)
+    if user is None or user["password"] != password:
         return jsonify({"error": "Invalid credentials"}), 401
 
-    with open("users.json") as f:
-        users = json.load(f)
-
-    if email not in users or users[email]["password"] != password:
-        return jsonify({"error": "Invalid credentials"}), 401
-
-    return jsonify({"message": "Login success", "name": users[email]["name"]})
+    return jsonify({"message": "Login success", "name": user["name"]})
 
 # --------------------------------------------------
 # RESUME
@@ -119,14 +137,24 @@ def parse_resume():
     if "resume" not in request.files:
         return jsonify({"error": "No file"}), 400
 
-    text = extract_text(request.files["resume"])
-    data = extract_resume_with_llama(text)
+    try:
+        extraction = extract_resume_text(request.files["resume"])
+    except DocumentTooLargeError as e:
+        return jsonify({"error": str(e)}), 413
+    except DocumentError as e:
+        return jsonify({"error": str(e)}), 400
+    except ExtractionBusyError as e:
+        return jsonify({"error": str(e)}), 503
+    except TimeoutError as e:
+        return jsonify({"error": str(e)}), 504
+    data = extract_resume_with_llama(extraction["text"])
 
     return jsonify({
         "skills": data["skills"],
         "experience": data["years_of_experience"],
         "education": data["education"],
-        "certifications": data["certifications"]
+        "certifications": data["certifications"],
+        "truncated": extraction["truncated"]
     })
 
 # --------------------------------------------------
@@ -153,18 +181,68 @@ def analyze_with_jd():
 # SKILLS
 # --------------------------------------------------
 
+# Verification quizzes generated ahead of time by /analyze_skills,
+# keyed by role and matched skills, so /verify_skills can answer immediately.
+QUIZ_PREFETCH_MAX = 256
+QUIZ_PREFETCH_TTL_SECONDS = 15 * 60
+_quiz_prefetch = OrderedDict()
+_quiz_prefetch_lock = threading.Lock()
+
+def _quiz_key(role, skills):
+    return ((role or "").strip().lower(), tuple(sorted(s.strip().lower() for s in skills)))
+
+def _store_prefetched_quiz(role, skills, questions):
+    with _quiz_prefetch_lock:
+        _quiz_prefetch[_quiz_key(role, skills)] = (time.time(), questions)
+        while len(_quiz_prefetch) > QUIZ_PREFETCH_MAX:
+            _quiz_prefetch.popitem(last=False)
+
+def _pop_prefetched_quiz(role, skills):
+    with _quiz_prefetch_lock:
+        entry = _quiz_prefetch.pop(_quiz_key(role, skills), None)
+    if entry and time.time() - entry[0] < QUIZ_PREFETCH_TTL_SECONDS:
+        return entry[1]
+    return None
+
 @app.route("/analyze_skills", methods=["POST"])
 def analyze_skills():
     data = request.json
     role = data.get("role")
     user_skills = data.get("user_skills", [])
+    user_lower = {s.strip().lower() for s in user_skills}
+
+    def matched_skills(market_skills):
+        return [s for s in market_skills if s.strip().lower() in user_lower]
 
-    market_skills = get_market_skills(role)
-    recommendations = analyze_skills_with_llama(user_skills, market_skills)
+    def prefetch_quiz(matched):
+        _store_prefetched_quiz(role, matched, generate_verification_questions(role, matched))
+
+    def market_stage():
+        market_skills = get_market_skills(role)
+        # Warm the verification quiz without making this request wait for it
+        # (skipped when the background queue is full; /verify_skills then generates it)
+        matched = matched_skills(market_skills)
+        if matched:
+            run_in_background(prefetch_quiz, matched)
+        return market_skills
+
+    def recommendations_stage(market_skills):
+        return analyze_skills_with_llama(user_skills, market_skills)
+
+    results, timings, errors = run_stage_graph({
+        "market_skills": (market_stage, []),
+        "recommendations": (recommendations_stage, ["market_skills"]),
+    })
+
+    for required in ("market_skills", "recommendations"):
+        if required in errors:
+            raise errors[required]
 
     return jsonify({
-        "market_skills": market_skills,
-        "recommendations": recommendations
+        "market_skills": results["market_skills"],
+        "recommendations": results["recommendations"],
+        "common_skills": matched_skills(results["market_skills"]),
+        "timings_ms": timings
     })
 
 # --------------------------------------------------
@@ -177,7 +255,14 @@ def generate_quiz():
 
 @app.route("/verify_skills", methods=["POST"])
 def verify_skills():
-    return jsonify([])
+    data = request.json or {}
+    role = data.get("role")
+    skills = data.get("matched_skills") or []
+
+    questions = _pop_prefetched_quiz(role, skills)
+    if questions is None:
+        questions = generate_verification_questions(role, skills)
+    return jsonify(questions)
 
 # --------------------------------------------------
 # INTERVIEW PREP
@@ -212,6 +297,17 @@ def curriculum_plan():
 def home():
     return {"status": "Backend running successfully (Render safe)"}
 
+@app.route("/metrics")
+def metrics():
+    pool = get_default_pool()
+    return jsonify({
+        "extraction": get_extraction_stats(),
+        "extraction_pool": pool.stats() if pool is not None else None,
+        "user_cache": user_store.cache_stats(),
+        "llm_singleflight": get_singleflight_stats(),
+        "background_tasks": get_background_stats()
+    })
+
 # --------------------------------------------------
 # APP RUN
 # --------------------------------------------------
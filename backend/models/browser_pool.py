@@ -0,0 +1,165 @@
+import atexit
+import itertools
+import os
+import threading
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service as ChromeService
+from webdriver_manager.chrome import ChromeDriverManager
+
+# Set CHROMEDRIVER_PATH to skip webdriver_manager's lookup entirely
+CHROMEDRIVER_PATH = os.getenv("CHROMEDRIVER_PATH", "")
+SCRAPER_HEADLESS = os.getenv("SCRAPER_HEADLESS", "1") != "0"
+# Idle browsers kept warm, and pages a browser may load before it is replaced
+BROWSER_POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", "4"))
+BROWSER_MAX_PAGES = int(os.getenv("BROWSER_MAX_PAGES", "200"))
+
+# 2 = block. Job pages only need the DOM text.
+_BLOCKED_CONTENT_PREFS = {
+    "profile.managed_default_content_settings.images": 2,
+    "profile.managed_default_content_settings.stylesheets": 2,
+    "profile.managed_default_content_settings.fonts": 2,
+    "profile.managed_default_content_settings.media_stream": 2,
+}
+
+_driver_path = None
+_driver_path_lock = threading.Lock()
+
+
+def chromedriver_path():
+    """Resolve the chromedriver binary once per process (env override, else webdriver_manager)."""
+    global _driver_path
+    with _driver_path_lock:
+        if _driver_path is None:
+            _driver_path = CHROMEDRIVER_PATH or ChromeDriverManager().install()
+        return _driver_path
+
+
+def make_chrome_driver(headless=SCRAPER_HEADLESS):
+    """Start Chrome with the scraper's options."""
+    chrome_options = webdriver.ChromeOptions()
+    if headless:
+        chrome_options.add_argument("--headless=new")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--disable-extensions")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+    chrome_options.add_argument("--disable-popup-blocking")
+    chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+    chrome_options.add_argument("--window-size=1200x800")
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    chrome_options.add_experimental_option("prefs", _BLOCKED_CONTENT_PREFS)
+
+    return webdriver.Chrome(service=ChromeService(chromedriver_path()), options=chrome_options)
+
+
+class BrowserPool:
+    """
+    Keeps started browsers warm between scrapes.
+
+    acquire() hands out an idle browser that passes a health check, or starts
+    a new one; release() puts it back. A browser that has loaded `max_pages`
+    pages (record_page) or that failed is quit instead of reused, which
+    bounds Chrome's memory growth. At most `max_idle` browsers are kept.
+    """
+
+    def __init__(self, factory=make_chrome_driver, max_idle=BROWSER_POOL_SIZE, max_pages=BROWSER_MAX_PAGES):
+        self.factory = factory
+        self.max_idle = max_idle
+        self.max_pages = max_pages
+        self._idle = []
+        self._pages = {}  # driver token -> pages loaded
+        self._tokens = itertools.count()
+        self._lock = threading.Lock()
+        self._stats = {"started": 0, "reused": 0, "recycled": 0, "unhealthy": 0}
+
+    def _token(self, driver):
+        """
+        Key of a browser in `_pages`, stored on the driver itself. Unlike
+        id(driver) it cannot be reused by a new driver after one is freed.
+        Call with the lock held.
+        """
+        token = getattr(driver, "_browser_pool_token", None)
+        if token is None:
+            token = driver._browser_pool_token = next(self._tokens)
+        return token
+
+    def _healthy(self, driver):
+        try:
+            driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def _quit(self, driver):
+        with self._lock:
+            self._pages.pop(self._token(driver), None)
+        try:
+            driver.quit()
+        except Exception as e:
+            print(f"Error closing browser: {e}")
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                driver = self._idle.pop() if self._idle else None
+            if driver is None:
+                break
+            if self._healthy(driver):
+                with self._lock:
+                    self._stats["reused"] += 1
+                return driver
+            with self._lock:
+                self._stats["unhealthy"] += 1
+            self._quit(driver)
+
+        driver = self.factory()
+        with self._lock:
+            self._pages[self._token(driver)] = 0
+            self._stats["started"] += 1
+        return driver
+
+    def record_page(self, driver):
+        with self._lock:
+            token = self._token(driver)
+            self._pages[token] = self._pages.get(token, 0) + 1
+
+    def release(self, driver, healthy=True):
+        """Return a browser to the pool; worn-out, failed or surplus browsers are quit."""
+        with self._lock:
+            worn_out = self._pages.get(self._token(driver), 0) >= self.max_pages
+            keep = healthy and not worn_out and len(self._idle) < self.max_idle
+            if keep:
+                self._idle.append(driver)
+            elif worn_out:
+                self._stats["recycled"] += 1
+        if not keep:
+            self._quit(driver)
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for driver in idle:
+            self._quit(driver)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["idle"] = len(self._idle)
+        return stats
+
+
+_default_pool = None
+_default_pool_lock = threading.Lock()
+
+
+def get_browser_pool():
+    """Process-wide pool of Chrome sessions shared by all scraper instances."""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = BrowserPool()
+            # Idle Chrome processes would otherwise outlive the server
+            atexit.register(_default_pool.close)
+        return _default_pool
@@ -0,0 +1,398 @@
+import argparse
+import itertools
+import json
+import os
+import threading
+
+# Sidecar file next to a corpus holding one [id, byte offset] JSON line per record
+INDEX_SUFFIX = ".idx"
+# Sidecar next to a JSONL corpus recording that its legacy .json was folded in
+MIGRATED_SUFFIX = ".migrated"
+
+_migrate_lock = threading.Lock()
+
+
+def _corpus_pair(path):
+    """(legacy .json path, .jsonl path) for either spelling, or (None, path) for other files."""
+    if path.endswith(".jsonl"):
+        return path[:-1], path
+    if path.endswith(".json"):
+        return path, path + "l"
+    return None, path
+
+
+def _legacy_signature(json_path):
+    stat = os.stat(json_path)
+    return f"{stat.st_size} {stat.st_mtime_ns}"
+
+
+def _is_migrated(json_path, jsonl_path):
+    # The marker stores the legacy file's size and mtime, so an edited legacy file is read again
+    try:
+        with open(jsonl_path + MIGRATED_SUFFIX, 'r') as f:
+            return f.read().strip() == _legacy_signature(json_path)
+    except OSError:
+        return False
+
+
+def corpus_files(path):
+    """
+    The files that make up a corpus, oldest first. 'job_skills.json' and
+    'job_skills.jsonl' name the same corpus: the legacy .json is read before
+    the JSONL until it has been folded into it (by convert_json_to_jsonl or
+    the first CorpusWriter), then only the JSONL is read.
+    """
+    json_path, jsonl_path = _corpus_pair(path)
+    if json_path is None:
+        return [path]
+
+    files = []
+    if os.path.exists(json_path) and not _is_migrated(json_path, jsonl_path):
+        files.append(json_path)
+    if os.path.exists(jsonl_path):
+        files.append(jsonl_path)
+    return files or [path]
+
+
+def resolve_path(path):
+    """
+    The newest file of a corpus (see corpus_files): 'job_skills.json' resolves
+    to 'job_skills.jsonl' once that file exists, so callers can keep their old paths.
+    """
+    return corpus_files(path)[-1]
+
+
+def corpus_signature(path):
+    """(file, size, mtime) of every file of a corpus; changes whenever any of them does."""
+    signature = []
+    for file_path in corpus_files(path):
+        stat = os.stat(file_path)
+        signature.append((file_path, stat.st_size, stat.st_mtime_ns))
+    return tuple(signature)
+
+
+def _iter_file_records(path):
+    if not path.endswith(".jsonl"):
+        with open(path, 'r') as f:
+            yield from json.load(f).items()
+        return
+
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+                yield record["id"], record["value"]
+            except (ValueError, KeyError):
+                continue
+
+
+def iter_records(path):
+    """
+    Stream (id, value) pairs from a corpus without loading it into memory.
+    Legacy .json files (one object) are still accepted, but are read whole;
+    an unmigrated legacy file is read before its JSONL continuation.
+    A torn last line from a crash mid-append is skipped.
+    """
+    for file_path in corpus_files(path):
+        yield from _iter_file_records(file_path)
+
+
+def read_appended(path, offset=0):
+    """
+    Records of a JSONL file from byte `offset` on, and the offset to continue
+    from next time. Only complete lines are consumed, so a record that is
+    being written right now is picked up by the next call.
+    """
+    records = []
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            offset += len(line)
+            try:
+                record = json.loads(line)
+                records.append((record["id"], record["value"]))
+            except (ValueError, KeyError):
+                continue
+    return records, offset
+
+
+def load_corpus(path):
+    """Whole corpus as a dict; a later record with the same id replaces an earlier one."""
+    return dict(iter_records(path))
+
+
+class CorpusWriter:
+    """
+    Append-only JSONL writer. Each record is one line {"id": ..., "value": ...},
+    flushed as it is written, so a crash loses at most the line in progress.
+    With `index=True` the byte offset of every record is appended to the
+    sidecar index, which read_record() uses for random access by id.
+    Opening a writer on a .jsonl whose legacy .json was never migrated
+    migrates it first (see migrate_legacy_json).
+    """
+
+    def __init__(self, path, index=True):
+        # Records are never appended to a legacy .json file, only to its JSONL continuation
+        path = path + "l" if path.endswith(".json") else path
+        self.path = path
+        # The first write to a corpus folds in its legacy .json, so no records are left behind
+        migrate_legacy_json(path)
+        self._file = open(path, 'ab')
+        self._end_torn_line()
+        self._index = open(path + INDEX_SUFFIX, 'a') if index else None
+        self._lock = threading.Lock()
+        self.written = 0
+
+    def _end_torn_line(self):
+        # A crash mid-append leaves a partial last line; terminate it so the
+        # next record starts on its own line (readers skip the fragment)
+        if self._file.seek(0, os.SEEK_END) == 0:
+            return
+        with open(self.path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                self._file.write(b"\n")
+                self._file.flush()
+
+    def append(self, record_id, value):
+        line = json.dumps({"id": record_id, "value": value}, ensure_ascii=False).encode('utf-8') + b"\n"
+        with self._lock:
+            offset = self._file.seek(0, os.SEEK_END)
+            self._file.write(line)
+            self._file.flush()
+            if self._index is not None:
+                self._index.write(json.dumps([record_id, offset]) + "\n")
+                self._index.flush()
+            self.written += 1
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+            if self._index is not None:
+                self._index.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def append_records(path, records, index=True):
+    """Append (id, value) pairs to a corpus. Returns the number written."""
+    with CorpusWriter(path, index=index) as writer:
+        for record_id, value in records:
+            writer.append(record_id, value)
+        return writer.written
+
+
+def write_corpus(path, records, index=True):
+    """Replace a corpus with `records`, via a temp file so readers never see a half-written one."""
+    temp_path = path + ".tmp"
+    for stale in (temp_path, temp_path + INDEX_SUFFIX):
+        if os.path.exists(stale):
+            os.remove(stale)
+
+    written = append_records(temp_path, records, index=index)
+    # Data first: an index that is briefly older than the data is detected and
+    # caught up by readers, an index pointing into the wrong data is not
+    os.replace(temp_path, path)
+    if index:
+        os.replace(temp_path + INDEX_SUFFIX, path + INDEX_SUFFIX)
+    elif os.path.exists(path + INDEX_SUFFIX):
+        os.remove(path + INDEX_SUFFIX)
+    return written
+
+
+def migrate_legacy_json(path):
+    """
+    Fold the legacy .json corpus next to `path` into the JSONL corpus, once.
+    Legacy records are written first, so JSONL records with the same id still
+    win. Afterwards a marker makes readers skip the legacy file. Returns the
+    number of legacy records migrated.
+    """
+    json_path, jsonl_path = _corpus_pair(path)
+    if json_path is None or not os.path.exists(json_path):
+        return 0
+
+    with _migrate_lock:
+        if _is_migrated(json_path, jsonl_path):
+            return 0
+        signature = _legacy_signature(json_path)
+        with open(json_path, 'r') as f:
+            legacy = json.load(f)
+        existing = list(_iter_file_records(jsonl_path)) if os.path.exists(jsonl_path) else []
+
+        write_corpus(jsonl_path, itertools.chain(legacy.items(), existing))
+        with open(jsonl_path + MIGRATED_SUFFIX, 'w') as f:
+            f.write(signature)
+
+    print(f"Migrated {len(legacy)} records from {json_path} into {jsonl_path}")
+    return len(legacy)
+
+
+def build_index(path):
+    """(Re)build the sidecar index of a JSONL corpus with one sequential scan."""
+    with open(path, 'rb') as f, open(path + INDEX_SUFFIX + ".tmp", 'w') as index:
+        offset = 0
+        for line in f:
+            try:
+                record_id = json.loads(line)["id"]
+            except (ValueError, KeyError):
+                record_id = None
+            if record_id is not None:
+                index.write(json.dumps([record_id, offset]) + "\n")
+            offset += len(line)
+    os.replace(path + INDEX_SUFFIX + ".tmp", path + INDEX_SUFFIX)
+
+
+_offset_cache = {}
+_offset_lock = threading.Lock()
+
+
+def _read_offsets(index_path):
+    offsets = {}
+    with open(index_path, 'r') as f:
+        for line in f:
+            try:
+                record_id, offset = json.loads(line)
+            except ValueError:
+                continue
+            offsets[record_id] = offset
+    return offsets
+
+
+def _scan_offsets(path, start):
+    """{id: offset} of the complete records at or after byte `start`."""
+    offsets = {}
+    with open(path, 'rb') as f:
+        f.seek(start)
+        offset = start
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                offsets[json.loads(line)["id"]] = offset
+            except (ValueError, KeyError):
+                pass
+            offset += len(line)
+    return offsets
+
+
+def _indexed_end(path, offsets):
+    """Byte offset just past the last indexed record, or None if the index does not fit the data file."""
+    if not offsets:
+        return 0
+    record_id, offset = max(offsets.items(), key=lambda item: item[1])
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        line = f.readline()
+    try:
+        if json.loads(line)["id"] == record_id:
+            return offset + len(line)
+    except (ValueError, KeyError):
+        pass
+    return None
+
+
+def _load_offsets(path):
+    """
+    {id: offset} for a JSONL corpus. The sidecar index is checked against the
+    data file: records appended without index lines are scanned from the
+    last indexed record on, and an index that does not match the data at all
+    (rewritten or truncated file) is rebuilt.
+    """
+    index_path = path + INDEX_SUFFIX
+    if not os.path.exists(index_path):
+        build_index(path)
+    data_stat = os.stat(path)
+    index_stat = os.stat(index_path)
+    key = (data_stat.st_size, data_stat.st_mtime_ns, index_stat.st_size, index_stat.st_mtime_ns)
+
+    with _offset_lock:
+        cached = _offset_cache.get(path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+    offsets = _read_offsets(index_path)
+    end = _indexed_end(path, offsets)
+    if end is None:
+        print(f"Index {index_path} does not match {path}; rebuilding it.")
+        build_index(path)
+        offsets = _read_offsets(index_path)
+    elif end < data_stat.st_size:
+        offsets.update(_scan_offsets(path, end))
+
+    with _offset_lock:
+        _offset_cache[path] = (key, offsets)
+    return offsets
+
+
+def read_record(path, record_id):
+    """
+    Random access by id through the sidecar index (built on first use).
+    Falls back to an unmigrated legacy .json file. Returns None if absent.
+    """
+    files = corpus_files(path)
+    jsonl_path = files[-1]
+    if jsonl_path.endswith(".jsonl") and os.path.exists(jsonl_path):
+        offset = _load_offsets(jsonl_path).get(record_id)
+        if offset is not None:
+            with open(jsonl_path, 'rb') as f:
+                f.seek(offset)
+                return json.loads(f.readline())["value"]
+
+    for file_path in files:
+        if not file_path.endswith(".jsonl") and os.path.exists(file_path):
+            with open(file_path, 'r') as f:
+                return json.load(f).get(record_id)
+    return None
+
+
+def count_records(path):
+    """Number of distinct ids in a corpus, from the JSONL index plus any unmigrated legacy file."""
+    ids = set()
+    for file_path in corpus_files(path):
+        if not os.path.exists(file_path):
+            continue
+        if file_path.endswith(".jsonl"):
+            ids.update(_load_offsets(file_path))
+        else:
+            with open(file_path, 'r') as f:
+                ids.update(json.load(f))
+    return len(ids)
+
+
+def convert_json_to_jsonl(json_path, jsonl_path=None, index=True):
+    """
+    Convert a legacy {id: value} JSON file to a JSONL corpus. Records already
+    appended to the default JSONL sibling are kept (see migrate_legacy_json).
+    Returns the number of legacy records.
+    """
+    if jsonl_path is None or jsonl_path == json_path + "l":
+        written = migrate_legacy_json(json_path)
+        if not index and os.path.exists(json_path + "l" + INDEX_SUFFIX):
+            os.remove(json_path + "l" + INDEX_SUFFIX)
+        return written
+
+    with open(json_path, 'r') as f:
+        data = json.load(f)
+    written = write_corpus(jsonl_path, data.items(), index=index)
+    print(f"Converted {written} records from {json_path} to {jsonl_path}")
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert legacy JSON corpora to JSONL.")
+    parser.add_argument("files", nargs="+", help="JSON files, e.g. job_descriptions.json job_skills.json")
+    parser.add_argument("--no-index", action="store_true", help="Skip writing the .idx offset sidecar")
+    args = parser.parse_args(argv)
+
+    for json_path in args.files:
+        convert_json_to_jsonl(json_path, index=not args.no_index)
+
+
+if __name__ == "__main__":
+    main()
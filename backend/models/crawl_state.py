@@ -0,0 +1,117 @@
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from urllib.parse import urlparse
+
+CRAWL_STATE_PATH = os.getenv("CRAWL_STATE_PATH", "crawl_state.sqlite3")
+
+# LinkedIn posting IDs in /jobs/view/<id>, currentJobId=<id> or urn:li:jobPosting:<id>
+_POSTING_ID_RE = re.compile(r"(?:/jobs/view/(?:[^/?#]*-)?|currentJobId=|jobPosting:)(\d+)")
+
+
+def posting_id(url_or_id):
+    """
+    LinkedIn posting ID of a bare ID, job URL or 'urn:li:jobPosting:<id>' URN,
+    or None. Only the real ID position counts, not digits in the title slug.
+    """
+    value = str(url_or_id).strip()
+    if value.isdigit():
+        return value
+    match = _POSTING_ID_RE.search(value)
+    return match.group(1) if match else None
+
+
+def posting_key(url_or_id):
+    """
+    Stable key for a job posting: 'li:<posting id>' when a LinkedIn ID can be
+    found, otherwise a hash of the URL without its query string (tracking
+    parameters change between searches).
+    """
+    value = str(url_or_id).strip()
+    found = posting_id(value)
+    if found is not None:
+        return f"li:{found}"
+    parsed = urlparse(value)
+    normalized = f"{parsed.netloc.lower()}{parsed.path.rstrip('/')}"
+    return "url:" + hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:20]
+
+
+class CrawlState:
+    """
+    SQLite (WAL mode) record of every posting the scrapers have seen, keyed
+    by posting_key(). Scrapers ask for the unseen keys before fetching
+    anything, so a refresh only costs requests for new postings. Known
+    postings still get their last_seen timestamp bumped, which shows how
+    long a posting stayed listed.
+    """
+
+    def __init__(self, path=CRAWL_STATE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=10)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS postings (
+                posting_key TEXT PRIMARY KEY,
+                url TEXT,
+                first_seen REAL NOT NULL,
+                last_seen REAL NOT NULL
+            )
+            """
+        )
+
+    def filter_new(self, keys):
+        """
+        Return the keys that have not been scraped yet, in the given order,
+        and bump last_seen for the ones that have.
+        """
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return []
+
+        now = time.time()
+        known = set()
+        with self._lock:
+            # Chunked to stay under SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                known.update(row[0] for row in self._conn.execute(
+                    f"SELECT posting_key FROM postings WHERE posting_key IN ({placeholders})", chunk
+                ))
+            if known:
+                self._conn.executemany("UPDATE postings SET last_seen = ? WHERE posting_key = ?",
+                                       [(now, key) for key in known])
+        return [key for key in keys if key not in known]
+
+    def mark_scraped(self, key, url=None):
+        """Record a successfully scraped posting."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT INTO postings (posting_key, url, first_seen, last_seen)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(posting_key) DO UPDATE SET
+                    url = COALESCE(excluded.url, url),
+                    last_seen = excluded.last_seen
+                """,
+                (key, url, now, now),
+            )
+
+    def count(self):
+        with self._lock:
+            (total,) = self._conn.execute("SELECT COUNT(*) FROM postings").fetchone()
+        return total
+
+    def stats(self):
+        with self._lock:
+            total, oldest, newest = self._conn.execute(
+                "SELECT COUNT(*), MIN(first_seen), MAX(last_seen) FROM postings"
+            ).fetchone()
+        return {"postings": total, "first_seen": oldest, "last_seen": newest}
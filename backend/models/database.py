@@ -0,0 +1,150 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+USERS_DB_PATH = os.getenv("USERS_DB_PATH", "users.sqlite3")
+# Size of the in-process user cache and how often to look for writes made by other workers
+USER_CACHE_MAX_ENTRIES = int(os.getenv("USER_CACHE_MAX_ENTRIES", "100000"))
+USER_CACHE_CHECK_SECONDS = float(os.getenv("USER_CACHE_CHECK_SECONDS", "1.0"))
+
+
+class UserStore:
+    """
+    SQLite (WAL mode) credential store keyed by email.
+    Lookups hit the primary-key index and registrations are single-row
+    inserts, so both stay constant-time as the user base grows. WAL lets
+    several gunicorn workers read while one of them writes.
+
+    Found users are kept in a process-wide LRU cache, so repeat logins are
+    dictionary lookups. Registrations write through the cache. The cache is
+    dropped whenever another process commits to the database, which SQLite
+    reports through PRAGMA data_version.
+    """
+
+    def __init__(self, path=USERS_DB_PATH, cache_max_entries=USER_CACHE_MAX_ENTRIES,
+                 cache_check_seconds=USER_CACHE_CHECK_SECONDS):
+        self.path = path
+        self.cache_max_entries = cache_max_entries
+        self.cache_check_seconds = cache_check_seconds
+        self._cache = OrderedDict()
+        self._data_version = None
+        self._next_check = 0.0
+        self._cache_stats = {"hits": 0, "misses": 0, "invalidations": 0}
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=10)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS users (
+                email TEXT PRIMARY KEY,
+                password TEXT NOT NULL,
+                name TEXT
+            )
+            """
+        )
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+
+    def _check_external_writes_locked(self):
+        # data_version only changes when another connection commits, so our
+        # own write-through inserts never invalidate the cache
+        now = time.monotonic()
+        if now < self._next_check:
+            return
+        self._next_check = now + self.cache_check_seconds
+
+        (version,) = self._conn.execute("PRAGMA data_version").fetchone()
+        if self._data_version is not None and version != self._data_version and self._cache:
+            self._cache.clear()
+            self._cache_stats["invalidations"] += 1
+        self._data_version = version
+
+    def _cache_put_locked(self, email, user):
+        self._cache[email] = user
+        self._cache.move_to_end(email)
+        while len(self._cache) > self.cache_max_entries:
+            self._cache.popitem(last=False)
+
+    def get_user(self, email):
+        """Return {"password", "name"} for `email`, or None if the user does not exist."""
+        with self._lock:
+            self._check_external_writes_locked()
+
+            user = self._cache.get(email)
+            if user is not None:
+                self._cache.move_to_end(email)
+                self._cache_stats["hits"] += 1
+                return dict(user)
+
+            # Unknown emails are not cached, so a user registered by another
+            # worker is found on their first login
+            self._cache_stats["misses"] += 1
+            row = self._conn.execute("SELECT password, name FROM users WHERE email = ?", (email,)).fetchone()
+            if row is None:
+                return None
+            user = {"password": row[0], "name": row[1]}
+            self._cache_put_locked(email, user)
+        return dict(user)
+
+    def add_user(self, email, password, name):
+        """Insert a new user. Returns False if the email is already registered."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO users (email, password, name) VALUES (?, ?, ?)",
+                (email, password, name),
+            )
+            added = cursor.rowcount == 1
+            if added:
+                self._cache_put_locked(email, {"password": password, "name": name})
+        return added
+
+    def cache_stats(self):
+        with self._lock:
+            stats = dict(self._cache_stats)
+            stats["size"] = len(self._cache)
+        return stats
+
+    def count(self):
+        with self._lock:
+            (total,) = self._conn.execute("SELECT COUNT(*) FROM users").fetchone()
+        return total
+
+    def migrate_from_json(self, json_path="users.json"):
+        """
+        Import users from the legacy users.json file. The file's mtime is
+        remembered, so an unchanged file is not re-read on every startup.
+        Existing rows are never overwritten.
+        """
+        if not os.path.exists(json_path):
+            return 0
+
+        mtime = str(os.path.getmtime(json_path))
+        meta_key = f"migrated:{os.path.abspath(json_path)}"
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (meta_key,)).fetchone()
+        if row is not None and row[0] == mtime:
+            return 0
+
+        with open(json_path) as f:
+            users = json.load(f)
+
+        rows = [(email, info.get("password"), info.get("name")) for email, info in users.items()]
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                before = self._conn.total_changes
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO users (email, password, name) VALUES (?, ?, ?)", rows
+                )
+                imported = self._conn.total_changes - before
+                self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (meta_key, mtime))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        print(f"Migrated {imported} users from {json_path}")
+        return imported
@@ -1,10 +1,4 @@
-import os
-import google.generativeai as genai
-from dotenv import load_dotenv
-
-load_dotenv()
-GOOGLE_API_KEY = os.getenv("Google_api_key")
-genai.configure(api_key=GOOGLE_API_KEY)
+from services.gpt_service import generate_text
 
 # Define the Gemini prompt template to analyze role, experience, and skills
 GEMINI_PROMPT_TEMPLATE = """
@@ -33,13 +27,9 @@ def analyze_text_with_llama(description):
     (Function name kept as 'analyze_text_with_llama' for compatibility, but uses Gemini).
     """
     try:
-        model = genai.GenerativeModel('gemini-1.5-flash')
-        
-        response = model.generate_content(
+        full_response = generate_text(
             GEMINI_PROMPT_TEMPLATE.format(description=description)
         )
-        
-        full_response = response.text
         print(f"DEBUG: Gemini Full Response: {full_response}")
 
         # Safe Default Values
@@ -1,8 +1,19 @@
 import json
-import requests
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
-# Ollama API URL for LLaMA model
-OLLAMA_API_URL = "http://127.0.0.1:11434/api/generate"
+from models.corpus import iter_records, write_corpus
+from models.response_cache import make_cache_key
+from services.ollama_client import OLLAMA_MODEL, RequiredFields, get_ollama_client
+
+OLLAMA_MODEL_NAME = OLLAMA_MODEL
+# Output lines the prompt asks for; the stream is closed once all of them are written
+EXTRACTION_FIELDS = ["Skills:", "Certifications:", "Years of Experience:", "Role:"]
+
+# Append-only record of finished extractions, so reruns only process new or changed descriptions
+EXTRACTION_CHECKPOINT_PATH = os.getenv("EXTRACTION_CHECKPOINT_PATH", "job_skills.checkpoint.jsonl")
+# Concurrent Ollama requests during batch extraction
+EXTRACTION_CONCURRENCY = int(os.getenv("EXTRACTION_CONCURRENCY", "4"))
 
 # Define a strict prompt asking for skills, certifications, years of experience, and role
 LLAMA_PROMPT_TEMPLATE = """
@@ -32,96 +43,149 @@ def extract_resume_with_llama(resume_text):
     # Format the prompt for LLaMA
     prompt = LLAMA_PROMPT_TEMPLATE.format(resume_text=resume_text)
     
-    # Send the request to Ollama API
-    response = requests.post(OLLAMA_API_URL, json={"prompt": prompt, "model": "llama3.1"}, timeout=60, stream=True)
+    # Stream from Ollama and hang up as soon as all four fields have been written
+    full_response = get_ollama_client().generate(
+        prompt, model=OLLAMA_MODEL_NAME, stop_when=RequiredFields(EXTRACTION_FIELDS)
+    )
+
+    try:
+        # Split the response into sections for skills, certifications, years of experience, and role
+        response_lines = full_response.strip().split("\n")
+
+        # Initialize empty fields
+        skills, certifications, years_of_experience, role = "", "None", "0", ""
+
+        # Process the response into structured fields
+        for line in response_lines:
+            if "Skills:" in line:
+                skills = line.split("Skills:")[1].strip()
+            elif "Certifications:" in line:
+                certifications = line.split("Certifications:")[1].strip()
+            elif "Years of Experience:" in line:
+                years_of_experience = line.split("Years of Experience:")[1].strip()
+            elif "Role:" in line:
+                role = line.split("Role:")[1].strip()
+
+        # Convert skills and certifications into lists
+        skills_list = [skill.strip() for skill in skills.split(",")] if skills else []
+        certifications_list = [cert.strip() for cert in certifications.split(",")] if certifications.lower() != "none" else []
+
+        # Return structured data as a dictionary
+        return {
+            "role": role,  # Added role
+            "skills": skills_list,
+            "certifications": certifications_list,
+            "years_of_experience": years_of_experience
+        }
     
-    # Check if the response is successful
-    if response.status_code == 200:
-        try:
-            # Initialize variables to store the response chunks
-            full_response = ""
-            
-            # Loop through the streaming response chunks
-            for chunk in response.iter_lines():
-                if chunk:
-                    # Decode the chunk and parse it as JSON
-                    data = json.loads(chunk.decode('utf-8'))
-                    
-                    # Check if we have a "response" field and append it
-                    if "response" in data:
-                        full_response += data["response"]
-                    
-                    # Stop if the response is marked as done
-                    if data.get("done_reason") == "stop":
-                        break
-
-            # Split the response into sections for skills, certifications, years of experience, and role
-            response_lines = full_response.strip().split("\n")
-
-            # Initialize empty fields
-            skills, certifications, years_of_experience, role = "", "None", "0", ""
-
-            # Process the response into structured fields
-            for line in response_lines:
-                if "Skills:" in line:
-                    skills = line.split("Skills:")[1].strip()
-                elif "Certifications:" in line:
-                    certifications = line.split("Certifications:")[1].strip()
-                elif "Years of Experience:" in line:
-                    years_of_experience = line.split("Years of Experience:")[1].strip()
-                elif "Role:" in line:
-                    role = line.split("Role:")[1].strip()
-
-            # Convert skills and certifications into lists
-            skills_list = [skill.strip() for skill in skills.split(",")] if skills else []
-            certifications_list = [cert.strip() for cert in certifications.split(",")] if certifications.lower() != "none" else []
-
-            # Return structured data as a dictionary
-            return {
-                "role": role,  # Added role
-                "skills": skills_list,
-                "certifications": certifications_list,
-                "years_of_experience": years_of_experience
-            }
-        
-        except Exception as e:
-            print(f"Error parsing the LLaMA response: {e}")
-            raise ValueError("Error parsing the LLaMA response: " + str(e))
-    else:
-        raise ValueError(f"Error from LLaMA API: {response.status_code}, {response.text}")
-
-def process_job_descriptions():
+    except Exception as e:
+        print(f"Error parsing the LLaMA response: {e}")
+        raise ValueError("Error parsing the LLaMA response: " + str(e))
+
+def description_hash(description):
+    """
+    Content hash of a job description. The prompt and model are part of the
+    hash, so changing either one re-extracts everything.
+    """
+    return make_cache_key(description, LLAMA_PROMPT_TEMPLATE, OLLAMA_MODEL_NAME)
+
+def load_checkpoint(checkpoint_path=EXTRACTION_CHECKPOINT_PATH):
+    """
+    Read finished extractions as {description hash: extracted info}.
+    A torn last line from a crash mid-write is ignored.
+    """
+    done = {}
+    if not os.path.exists(checkpoint_path):
+        return done
+
+    with open(checkpoint_path, 'r') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+                done[record["hash"]] = record["extracted"]
+            except (ValueError, KeyError):
+                continue
+    return done
+
+def write_checkpoint_record(checkpoint, content_hash, job, info):
+    """Append one finished extraction to an open checkpoint file and flush it."""
+    checkpoint.write(json.dumps({"hash": content_hash, "job": job, "extracted": info}) + "\n")
+    checkpoint.flush()
+
+def _extract_pending(pending, checkpoint_path, max_workers):
+    """
+    Run extractions with at most `max_workers` requests in flight, appending
+    each result to the checkpoint as soon as it arrives.
+    """
+    extracted = {}
+    pending = iter(pending)
+    in_flight = {}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor, open(checkpoint_path, 'a') as checkpoint:
+        while True:
+            # Keep the window full without queueing the whole corpus at once
+            while len(in_flight) < max_workers:
+                item = next(pending, None)
+                if item is None:
+                    break
+                content_hash, job, description = item
+                in_flight[executor.submit(extract_resume_with_llama, description)] = (content_hash, job)
+
+            if not in_flight:
+                break
+
+            finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in finished:
+                content_hash, job = in_flight.pop(future)
+                try:
+                    info = future.result()
+                except Exception as e:
+                    # Not checkpointed, so the next run retries it
+                    print(f"Error extracting data for {job}: {e}")
+                    continue
+
+                write_checkpoint_record(checkpoint, content_hash, job, info)
+                extracted[content_hash] = info
+
+    return extracted
+
+def process_job_descriptions(descriptions_path='job_descriptions.json', output_path='job_skills.jsonl',
+                             checkpoint_path=EXTRACTION_CHECKPOINT_PATH, max_workers=EXTRACTION_CONCURRENCY):
     """
     Read job descriptions, extract skills, certifications, years of experience, and role using LLaMA, 
-    and store the results in a JSON file with roles as keys.
+    and store the results in a JSONL corpus with roles as record ids.
+
+    Resumable: descriptions are content-hashed, and ones already in the
+    checkpoint file are not sent to the model again. The descriptions are
+    streamed, so the corpus does not have to fit in memory.
     """
-    # Load job descriptions from JSON
-    with open('job_descriptions.json', 'r') as f:
-        job_descriptions = json.load(f)
-
-    # Initialize a dictionary to store the extracted data
-    extracted_data = {}
-
-    # Iterate over each job description
-    for job, description in job_descriptions.items():
-        try:
-            # Extract information from the job description using LLaMA
-            extracted_info = extract_resume_with_llama(description)
-            
-            # Use the role as the key in the extracted data
-            role = extracted_info["role"]
-            
-            # If the role is empty, use a fallback key
-            if role:
-                extracted_data[role] = extracted_info
-            else:
-                extracted_data[f"job_{job}"] = extracted_info  # Fallback in case role is not present
-        except Exception as e:
-            print(f"Error extracting data for {job}: {e}")
-            continue
-
-    # Write the extracted data to a new JSON file
-    with open('job_skills.json', 'w') as f:
-        json.dump(extracted_data, f, indent=4)
-
-    print("Skills extraction completed and saved to 'job_skills.json'.")
+    done = load_checkpoint(checkpoint_path)
+    job_hashes = []  # (job, description hash) in corpus order
+    queued = set()
+
+    def pending():
+        for job, description in iter_records(descriptions_path):
+            content_hash = description_hash(description)
+            job_hashes.append((job, content_hash))
+            # Identical descriptions are extracted once
+            if content_hash in done or content_hash in queued:
+                continue
+            queued.add(content_hash)
+            yield content_hash, job, description
+
+    done.update(_extract_pending(pending(), checkpoint_path, max_workers))
+    print(f"{len(job_hashes) - len(queued)} descriptions already extracted, {len(queued)} processed.")
+
+    def extracted_records():
+        for job, content_hash in job_hashes:
+            extracted_info = done.get(content_hash)
+            if extracted_info is None:
+                continue
+
+            # Use the role as the record id, with a fallback key in case role is not present
+            yield extracted_info["role"] or f"job_{job}", extracted_info
+
+    # write_corpus goes through a temp file, so a crash never leaves a half-written corpus
+    write_corpus(output_path, extracted_records())
+
+    print(f"Skills extraction completed and saved to '{output_path}'.")
@@ -1,8 +1,11 @@
-import requests
-import json
+from models.corpus import load_corpus
+from models.gap_scoring import load_gap_engine
+from models.skill_index import SkillIndex, load_skill_index
+from models.skill_registry import skill_registry
+from services.ollama_client import RequiredFields, get_ollama_client
 
-# Ollama API URL for LLaMA model
-OLLAMA_API_URL = "http://127.0.0.1:11434/api/generate"
+# Output lines the prompt asks for; the stream is closed once all of them are written
+ANALYSIS_FIELDS = ["Skills:", "Certifications:", "Years of Experience:"]
 
 # Define the LLaMA prompt template to analyze curriculum and extract skills
 LLAMA_PROMPT_TEMPLATE = """
@@ -30,73 +33,52 @@ def analyze_text_with_llama(description):
     # Format the prompt for LLaMA
     prompt = LLAMA_PROMPT_TEMPLATE.format(description=description)
     
-    # Send the request to Ollama API
-    response = requests.post(OLLAMA_API_URL, json={"prompt": prompt, "model": "llama3.1"}, timeout=60, stream=True)
+    # Stream from Ollama and hang up as soon as all three fields have been written
+    full_response = get_ollama_client().generate(prompt, stop_when=RequiredFields(ANALYSIS_FIELDS))
+
+    try:
+        # Split the response into sections for skills, certifications, and experience
+        response_lines = full_response.strip().split("\n")
+
+        certifications, experience, skills = "None", "0", []
+        for line in response_lines:
+            if "Certifications:" in line:
+                certifications = line.split("Certifications:")[1].strip()
+            elif "Experience:" in line:
+                experience = line.split("Experience:")[1].strip()
+            elif "Skills:" in line:
+                skills = line.split("Skills:")[1].strip()
+
+        skills_list = [skill.strip() for skill in skills.split(",")] if skills else []
+
+        return {
+            "certifications": certifications,
+            "experience": experience,
+            "skills": skills_list
+        }
     
-    if response.status_code == 200:
-        try:
-            full_response = ""
-            for chunk in response.iter_lines():
-                if chunk:
-                    data = json.loads(chunk.decode('utf-8'))
-                    if "response" in data:
-                        full_response += data["response"]
-                    if data.get("done_reason") == "stop":
-                        break
-
-            # Split the response into sections for skills, certifications, and experience
-            response_lines = full_response.strip().split("\n")
-
-            certifications, experience, skills = "None", "0", []
-            for line in response_lines:
-                if "Certifications:" in line:
-                    certifications = line.split("Certifications:")[1].strip()
-                elif "Experience:" in line:
-                    experience = line.split("Experience:")[1].strip()
-                elif "Skills:" in line:
-                    skills = line.split("Skills:")[1].strip()
-
-            skills_list = [skill.strip() for skill in skills.split(",")] if skills else []
-
-            return {
-                "certifications": certifications,
-                "experience": experience,
-                "skills": skills_list
-            }
-        
-        except Exception as e:
-            raise ValueError(f"Error parsing the LLaMA response: {str(e)}")
-    else:
-        raise ValueError(f"Error from LLaMA API: {response.status_code}, {response.text}")
+    except Exception as e:
+        raise ValueError(f"Error parsing the LLaMA response: {str(e)}")
 
 def load_skills_data(file_path):
-    """Load the skills dataset from the provided JSON file."""
-    with open(file_path, 'r') as f:
-        return json.load(f)
+    """Load the skills dataset from the provided JSON or JSONL corpus file."""
+    return load_corpus(file_path)
 
 def compare_skills(extracted_skills, job_skills):
-    """Compare extracted skills with a given job's skills from the dataset."""
-    missing_skills = [skill for skill in job_skills if skill not in extracted_skills]
+    """Compare extracted skills with a given job's skills, matching on canonical skill IDs."""
+    job_skill_ids = dict.fromkeys(skill_registry.register(job_skills))
+    # Extracted skills come from the LLM, so they are compared without being interned
+    extracted_keys = {skill_registry.identity(skill) for skill in extracted_skills if str(skill).strip()}
+    missing_skills = [skill_registry.name_of(skill_id) for skill_id in job_skill_ids if skill_id not in extracted_keys]
     return missing_skills
 
 def suggest_improvements(extracted_skills, skills_data):
     """
     Suggest improvements by comparing the extracted skills with the skills from all jobs in the dataset.
+    `skills_data` may be the raw dataset or a prebuilt SkillIndex.
     """
-    suggestions = []
-    
-    for job, job_info in skills_data.items():
-        job_skills = job_info["skills"]
-        missing_skills = compare_skills(extracted_skills, job_skills)
-
-        if missing_skills:
-            suggestions.append({
-                "job": job,
-                "missing_skills": missing_skills,
-                "suggestion": f"To match {job}'s requirements, consider adding skills: {', '.join(missing_skills)}."
-            })
-
-    return suggestions
+    index = skills_data if isinstance(skills_data, SkillIndex) else SkillIndex(skills_data)
+    return index.suggest(extracted_skills)
 
 def analyze_and_suggest(description, skills_data_file):
     """
@@ -106,15 +88,23 @@ def analyze_and_suggest(description, skills_data_file):
     extracted_data = analyze_text_with_llama(description)
     extracted_skills = extracted_data["skills"]
 
-    # Load the skills dataset (from the provided `skills.json` file)
-    skills_data = load_skills_data(skills_data_file)
+    # Load the prebuilt skill index for the dataset (rebuilt only when the file changes)
+    skill_index = load_skill_index(skills_data_file)
 
     # Suggest improvements by comparing extracted skills with the skills in `skills.json`
-    suggestions = suggest_improvements(extracted_skills, skills_data)
+    suggestions = suggest_improvements(extracted_skills, skill_index)
 
     return {
         "extracted_data": extracted_data,
-        "suggestions": suggestions
+        "suggestions": suggestions,
+        "best_fit_roles": skill_index.rank_roles(extracted_skills)
     }
 
 
+def analyze_cohort(users_skills, skills_data_file, top_k=10):
+    """
+    Cohort-level gap report for many learners at once: best-fit roles per
+    learner plus the roles and missing skills that matter most to the whole cohort.
+    """
+    engine = load_gap_engine(skills_data_file)
+    return engine.cohort_report(users_skills, top_k=top_k)
@@ -0,0 +1,9 @@
+"""
+Main module of extraction worker processes.
+
+forkserver and spawn children re-import the parent's __main__ before they
+run any work. The extraction pool points __main__ here while it starts
+workers, so a server launched with `python app.py` does not build the Flask
+app, open the user store or run migrations once per worker. Keep this
+module free of imports and side effects.
+"""
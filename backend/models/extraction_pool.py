@@ -0,0 +1,206 @@
+import multiprocessing
+import os
+import sys
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from models import extraction_main, resume_text_extractor
+
+# Number of extraction processes; 0 keeps extraction on the request thread
+EXTRACTION_WORKERS = int(os.getenv("EXTRACTION_WORKERS", "0"))
+# Jobs allowed in flight (running + queued) before new uploads are refused
+EXTRACTION_MAX_PENDING = int(os.getenv("EXTRACTION_MAX_PENDING", str(max(EXTRACTION_WORKERS, 1) * 4)))
+EXTRACTION_TIMEOUT_SECONDS = float(os.getenv("EXTRACTION_TIMEOUT_SECONDS", "30"))
+# Workers must not be forked from the web process: the pool starts while Flask,
+# the LLM event loop and the stage executor threads may hold locks.
+EXTRACTION_START_METHOD = os.getenv(
+    "EXTRACTION_START_METHOD",
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn",
+)
+
+
+_main_lock = threading.Lock()
+
+
+class ExtractionBusyError(RuntimeError):
+    """Raised when the extraction queue is full and the upload should be retried later."""
+
+
+def _warm_worker():
+    """
+    Runs once per worker process. Importing this module already pulled in the
+    guarded fitz/docx2txt imports, so this only reports a missing PDF parser early.
+    """
+    if resume_text_extractor.fitz is None:
+        print("Extraction worker started without PyMuPDF; PDF jobs will fail.")
+
+
+def _ping():
+    return os.getpid()
+
+
+def _extract_job(data, filename, max_chars, max_pages):
+    return resume_text_extractor.extract_bounded_text_from_bytes(
+        data, filename, max_chars=max_chars, max_pages=max_pages
+    )
+
+
+@contextmanager
+def _worker_main():
+    """
+    While starting workers, make models.extraction_main the __main__ they
+    re-import, instead of the server's entry script (see that module).
+    ProcessPoolExecutor starts workers inside submit(), so wrap every submit.
+    """
+    with _main_lock:
+        main = sys.modules["__main__"]
+        sys.modules["__main__"] = extraction_main
+        try:
+            yield
+        finally:
+            sys.modules["__main__"] = main
+
+
+def _terminate_workers(executor):
+    """Kill an executor's worker processes (3.14 has terminate_workers(); older versions only keep _processes)."""
+    terminate = getattr(executor, "terminate_workers", None)
+    if terminate is not None:
+        terminate()
+        return
+    for process in list((getattr(executor, "_processes", None) or {}).values()):
+        process.terminate()
+
+
+class ExtractionPool:
+    """
+    Bounded process pool for CPU-bound PDF/DOCX parsing.
+    Keeps PyMuPDF off the web worker's GIL; refuses work once `max_pending`
+    jobs are in flight so a burst of uploads cannot queue without limit.
+    Workers are started with `start_method` (forkserver by default), never
+    forked from the threaded web process, and import models.extraction_main
+    as their __main__ rather than the server's entry script. A job still running at its timeout
+    is hung in PyMuPDF for good, so the whole pool is replaced and its
+    workers killed, which also gives the stuck job's queue slot back.
+    """
+
+    def __init__(self, max_workers=EXTRACTION_WORKERS, max_pending=EXTRACTION_MAX_PENDING,
+                 timeout=EXTRACTION_TIMEOUT_SECONDS, start_method=EXTRACTION_START_METHOD):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.start_method = start_method
+        self._executor = self._new_executor()
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._stats = {"submitted": 0, "completed": 0, "rejected": 0, "timeouts": 0, "failed": 0, "recycled": 0}
+
+    def _new_executor(self):
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context(self.start_method),
+            initializer=_warm_worker,
+        )
+
+    def warm_up(self):
+        """Start every worker process now instead of on the first upload."""
+        with _worker_main():
+            futures = [self._executor.submit(_ping) for _ in range(self.max_workers)]
+        for future in futures:
+            future.result()
+
+    def _recycle(self, executor):
+        """Replace `executor` with a fresh pool and kill its workers; no-op if it was already replaced."""
+        with self._lock:
+            if self._executor is not executor:
+                return
+            self._executor = self._new_executor()
+            self._stats["recycled"] += 1
+        print("Extraction job hung past its timeout; recycling the extraction pool.")
+        # Kill first: shutdown() drops the executor's process table
+        _terminate_workers(executor)
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+    def _release(self, future):
+        self._slots.release()
+        if future.cancelled():
+            return
+        self._count("failed" if future.exception() is not None else "completed")
+
+    def submit(self, data, filename, max_chars=resume_text_extractor.MAX_RESUME_CHARS,
+               max_pages=resume_text_extractor.MAX_RESUME_PAGES):
+        """Queue an extraction job, or raise ExtractionBusyError if the queue is full."""
+        if not self._slots.acquire(blocking=False):
+            self._count("rejected")
+            raise ExtractionBusyError("Document extraction queue is full, please retry shortly")
+
+        with self._lock:
+            executor = self._executor
+        try:
+            with _worker_main():
+                future = executor.submit(_extract_job, data, filename, max_chars, max_pages)
+        except Exception:
+            self._slots.release()
+            raise
+
+        self._count("submitted")
+        future.executor = executor
+        future.add_done_callback(self._release)
+        return future
+
+    def extract(self, data, filename, timeout=None, **budget):
+        """
+        Extract text in a worker process and wait at most `timeout` seconds.
+        A job that is still queued at the timeout is cancelled; one that is
+        already running gets its pool recycled.
+        """
+        future = self.submit(data, filename, **budget)
+        try:
+            result = future.result(timeout=timeout or self.timeout)
+        except FutureTimeoutError:
+            self._count("timeouts")
+            if not future.cancel():
+                self._recycle(future.executor)
+            raise TimeoutError(f"Document extraction exceeded {timeout or self.timeout} seconds")
+        except BrokenProcessPool:
+            # Killed along with a hung job when the pool was recycled
+            raise ExtractionBusyError("Document extraction was interrupted, please retry shortly")
+
+        # Workers keep their own counters, so record the outcome in this process too
+        resume_text_extractor.record_extraction(result["truncated"])
+        return result
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        stats["max_workers"] = self.max_workers
+        stats["max_pending"] = self.max_pending
+        return stats
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            executor = self._executor
+        executor.shutdown(wait=wait, cancel_futures=True)
+
+
+_default_pool = None
+_default_pool_lock = threading.Lock()
+
+
+def get_default_pool():
+    """Return the shared extraction pool, or None when EXTRACTION_WORKERS is 0."""
+    global _default_pool
+    if EXTRACTION_WORKERS <= 0:
+        return None
+
+    if _default_pool is None:
+        with _default_pool_lock:
+            if _default_pool is None:
+                _default_pool = ExtractionPool()
+                _default_pool.warm_up()
+    return _default_pool
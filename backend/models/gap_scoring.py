@@ -0,0 +1,241 @@
+import os
+import threading
+from collections import Counter
+
+# Safe import: the engine is optional and only needed for ranking/cohort reports
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from models.corpus import corpus_signature, load_corpus
+from models.skill_registry import skill_registry
+from models.skill_snapshot import current_snapshot
+
+# Users scored per block in batch mode, to bound the users x roles temporaries
+BATCH_BLOCK_SIZE = 64
+
+
+class GapScoringEngine:
+    """
+    Vectorized role-fit scoring over job_skills.json-style data.
+
+    Roles are stored as a sparse role x skill incidence matrix (CSR for
+    per-role lookups, CSC for scoring). Each skill is weighted by how many
+    roles ask for it, so widely demanded skills count for more. A user's
+    skills become a 0/1 vector over the same columns, and every role is
+    scored with one sparse matrix-vector product:
+
+        weighted_coverage[r] = sum(w[s] for s in role r that the user has) / sum(w[s] for s in role r)
+    """
+
+    def __init__(self, skills_data=None, registry=skill_registry, snapshot=None):
+        """Build from job_skills-style data, or straight from a SkillSnapshot's CSR arrays."""
+        if np is None:
+            raise ImportError("numpy is not installed on the server. Gap scoring is unavailable.")
+
+        self.registry = registry
+        if snapshot is not None:
+            # Snapshot skills are the columns, so indptr/indices are views of the mapping
+            self.roles = snapshot.role_names
+            column_ids = snapshot.skill_ids(registry)
+            self.indptr = np.frombuffer(snapshot.indptr, dtype=np.uint32)
+            self.indices = np.frombuffer(snapshot.indices, dtype=np.uint32)
+        else:
+            self.roles = []
+            columns = {}  # registry id -> column
+            indptr = [0]
+            indices = []
+
+            for role, info in skills_data.items():
+                row = dict.fromkeys(
+                    columns.setdefault(skill_id, len(columns))
+                    for skill_id in registry.register(info.get("skills", []))
+                )
+                indices.extend(row)
+                indptr.append(len(indices))
+                self.roles.append(role)
+
+            column_ids = list(columns)
+            self.indptr = np.array(indptr, dtype=np.int64)
+            self.indices = np.array(indices, dtype=np.int64)
+
+        self._columns = {skill_id: column for column, skill_id in enumerate(column_ids)}
+        self.column_ids = np.array(column_ids, dtype=np.int64)  # column -> registry id
+
+        # Skill weight = share of roles that require the skill
+        frequency = np.bincount(self.indices, minlength=len(column_ids))
+        self.weights = frequency.astype(np.float64) / max(len(self.roles), 1)
+
+        # Column-major copy (skill -> roles) so scoring only touches the
+        # posting lists of the skills a user actually has
+        self.row_lengths = np.diff(self.indptr.astype(np.int64))
+        role_of_entry = np.repeat(np.arange(len(self.roles), dtype=np.int64), self.row_lengths)
+        order = np.argsort(self.indices, kind="stable")
+        self.csc_indices = role_of_entry[order]
+        self.csc_indptr = np.concatenate(([0], np.cumsum(frequency))).astype(np.int64)
+
+        self.role_weight_totals = np.bincount(
+            role_of_entry, weights=self.weights[self.indices], minlength=len(self.roles)
+        )
+
+    @property
+    def shape(self):
+        return len(self.roles), len(self._columns)
+
+    def user_vector(self, user_skills):
+        """0/1 vector over the engine's skill columns; skills no role asks for are ignored."""
+        vector = np.zeros(len(self._columns), dtype=np.float64)
+        for skill_id in self.registry.known_ids(user_skills):
+            column = self._columns.get(skill_id)
+            if column is not None:
+                vector[column] = 1.0
+        return vector
+
+    def _sparse_product(self, block):
+        """
+        users x roles products of a block of user vectors with the incidence
+        matrix (weighted and unweighted), computed from the users' non-zeros.
+        """
+        role_count = len(self.roles)
+        users, skill_columns = np.nonzero(block)
+        lengths = self.csc_indptr[skill_columns + 1] - self.csc_indptr[skill_columns]
+        total = int(lengths.sum())
+
+        # Expand each (user, skill) pair into one entry per role that needs the skill
+        offsets = np.arange(total) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        roles = self.csc_indices[np.repeat(self.csc_indptr[skill_columns], lengths) + offsets]
+        cells = np.repeat(users, lengths) * role_count + roles
+
+        size = len(block) * role_count
+        weighted = np.bincount(cells, weights=np.repeat(self.weights[skill_columns], lengths), minlength=size)
+        matched = np.bincount(cells, minlength=size)
+        return weighted.reshape(len(block), role_count), matched.reshape(len(block), role_count)
+
+    def score_matrix(self, user_vectors):
+        """
+        Score a users x skills matrix against every role.
+        Returns (weighted_coverage, coverage), both users x roles.
+        """
+        user_vectors = np.atleast_2d(user_vectors)
+        weighted = np.zeros((user_vectors.shape[0], len(self.roles)))
+        coverage = np.zeros_like(weighted)
+
+        safe_weight = np.where(self.role_weight_totals > 0, self.role_weight_totals, 1.0)
+        safe_length = np.where(self.row_lengths > 0, self.row_lengths, 1)
+
+        for start in range(0, user_vectors.shape[0], BATCH_BLOCK_SIZE):
+            block = user_vectors[start:start + BATCH_BLOCK_SIZE]
+            weighted_block, matched_block = self._sparse_product(block)
+            weighted[start:start + len(block)] = weighted_block / safe_weight
+            coverage[start:start + len(block)] = matched_block / safe_length
+
+        return weighted, coverage
+
+    def _missing_skills(self, role_position, user_vector):
+        columns = self.indices[self.indptr[role_position]:self.indptr[role_position + 1]]
+        missing = columns[user_vector[columns] == 0]
+        # Most in-demand missing skills first
+        missing = missing[np.argsort(-self.weights[missing], kind="stable")]
+        return [self.registry.name_of(int(self.column_ids[column])) for column in missing]
+
+    def _top_roles(self, weighted_row, coverage_row, user_vector, top_k):
+        top_k = min(top_k, len(self.roles))
+        if top_k <= 0:
+            return []
+        candidates = np.argpartition(-weighted_row, top_k - 1)[:top_k]
+        ordered = candidates[np.lexsort((candidates, -weighted_row[candidates]))]
+        return [
+            {
+                "job": self.roles[position],
+                "score": round(float(weighted_row[position]), 4),
+                "coverage": round(float(coverage_row[position]), 4),
+                "missing_skills": self._missing_skills(position, user_vector),
+            }
+            for position in ordered
+        ]
+
+    def score(self, user_skills, top_k=10):
+        """Top-K best-fit roles for one user, with coverage ratios and missing skills."""
+        return self.score_batch([user_skills], top_k=top_k)[0]
+
+    def _score_users(self, users_skills):
+        vectors = np.vstack([self.user_vector(skills) for skills in users_skills])
+        weighted, coverage = self.score_matrix(vectors)
+        return vectors, weighted, coverage
+
+    def score_batch(self, users_skills, top_k=10):
+        """Top-K roles for many users at once (one list of results per user)."""
+        if not users_skills:
+            return []
+        vectors, weighted, coverage = self._score_users(users_skills)
+        return [
+            self._top_roles(weighted[i], coverage[i], vectors[i], top_k)
+            for i in range(len(users_skills))
+        ]
+
+    def cohort_report(self, users_skills, top_k=10, top_missing=10):
+        """
+        Cohort-level view: average fit per role across all users and the skills
+        the cohort most often lacks for its best-fit roles.
+        """
+        if not users_skills:
+            return {"users": 0, "roles": [], "common_missing_skills": []}
+
+        vectors, weighted, coverage = self._score_users(users_skills)
+        per_user = [
+            self._top_roles(weighted[i], coverage[i], vectors[i], top_k)
+            for i in range(len(users_skills))
+        ]
+        mean_weighted = weighted.mean(axis=0)
+        mean_coverage = coverage.mean(axis=0)
+
+        top_k = min(top_k, len(self.roles))
+        ordered = np.argsort(-mean_weighted, kind="stable")[:top_k]
+        missing_counts = Counter(
+            skill for results in per_user if results for skill in results[0]["missing_skills"]
+        )
+
+        return {
+            "users": len(users_skills),
+            "roles": [
+                {
+                    "job": self.roles[position],
+                    "mean_score": round(float(mean_weighted[position]), 4),
+                    "mean_coverage": round(float(mean_coverage[position]), 4),
+                }
+                for position in ordered
+            ],
+            "common_missing_skills": [
+                {"skill": skill, "users": count} for skill, count in missing_counts.most_common(top_missing)
+            ],
+            "per_user": per_user,
+        }
+
+
+_engine_cache = {}
+_engine_lock = threading.Lock()
+
+
+def load_gap_engine(file_path):
+    """
+    Build the scoring engine for a skills corpus file once, rebuilding only when the file changes.
+    A current skill snapshot of the corpus is read instead of the JSON when present.
+    """
+    path = os.path.abspath(file_path)
+    signature = corpus_signature(path)
+
+    with _engine_lock:
+        cached = _engine_cache.get(path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+    snapshot = current_snapshot(path)
+    if snapshot is not None:
+        engine = GapScoringEngine(snapshot=snapshot)
+    else:
+        engine = GapScoringEngine(load_corpus(path))
+
+    with _engine_lock:
+        _engine_cache[path] = (signature, engine)
+    return engine
@@ -0,0 +1,204 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Safe import: without lxml the scraper falls back to Selenium
+try:
+    from lxml import html as lxml_html
+except ImportError:
+    lxml_html = None
+
+from models.corpus import CorpusWriter
+from models.crawl_state import CrawlState, posting_id, posting_key
+
+LINKEDIN_BASE_URL = "https://www.linkedin.com"
+
+# Guest endpoints that serve plain HTML fragments without JavaScript or login
+SEARCH_PATH = "/jobs-guest/jobs/api/seeMoreJobPostings/search"
+POSTING_PATH = "/jobs-guest/jobs/api/jobPosting/{posting_id}"
+SEARCH_PAGE_SIZE = 25
+
+JOB_CARD_XPATH = '//*[@data-entity-urn]'
+JOB_LINK_XPATH = './/a[contains(@class, "base-card__full-link")]/@href'
+DESCRIPTION_XPATH = ('//*[contains(@class, "show-more-less-html__markup")'
+                     ' or contains(@class, "jobs-description-content__text")]')
+
+HTTP_TIMEOUT = 15
+USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+              "(KHTML, like Gecko) Chrome/124.0 Safari/537.36")
+
+
+def make_session(pool_size=8):
+    """requests.Session with keep-alive pooling sized for `pool_size` threads and retries on 429/5xx."""
+    session = requests.Session()
+    retry = Retry(total=3, backoff_factor=1.0, status_forcelist=(429, 500, 502, 503, 504),
+                  allowed_methods=("GET",), respect_retry_after_header=True)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"User-Agent": USER_AGENT, "Accept-Language": "en-US,en;q=0.9"})
+    return session
+
+
+def _element_text(element):
+    """Visible text of an element, one line per text node."""
+    return "\n".join(text.strip() for text in element.itertext() if text.strip())
+
+
+class HttpJobScraper:
+    """
+    Browserless scraper for LinkedIn's guest job pages.
+
+    Search result pages and postings are plain HTML, fetched over one pooled
+    requests.Session and parsed with lxml XPath, so a job costs one HTTP
+    request and a parse instead of a Chrome tab. Postings are fetched by
+    `workers` threads; requests to the host are spaced by a shared minimum
+    interval, and postings already in the crawl state are never fetched
+    again. When lxml is missing or the guest endpoints yield nothing
+    (auth wall, changed markup), the whole run falls back to the Selenium
+    LinkedInJobScraper. Same scrape_job_listings() contract as that class.
+    """
+
+    def __init__(self, base_url=LINKEDIN_BASE_URL, workers=4, min_interval=1.0, session=None,
+                 fallback_factory=None, crawl_state=None):
+        self.base_url = base_url.rstrip("/")
+        self.workers = max(1, workers)
+        self.min_interval = min_interval
+        self.session = session or make_session(self.workers)
+        self.fallback_factory = fallback_factory
+        self.last_stats = None
+        self.crawl_state = crawl_state or CrawlState()
+        self._known_skipped = 0
+        self._pace_lock = threading.Lock()
+        self._next_request = 0.0
+
+    def _get(self, path, params=None):
+        # Reserve the next request slot, then sleep outside the lock
+        with self._pace_lock:
+            now = time.monotonic()
+            slot = max(now, self._next_request)
+            self._next_request = slot + self.min_interval
+        if slot > now:
+            time.sleep(slot - now)
+
+        url = self.base_url + path
+        if params:
+            url += "?" + urlencode(params)
+        response = self.session.get(url, timeout=HTTP_TIMEOUT)
+        response.raise_for_status()
+        return response.text
+
+    def search_postings(self, role, location, job_limit=10):
+        """
+        IDs of postings not in the crawl state, from the guest search pages
+        (newest first). Stops at the first page without new postings.
+        """
+        posting_ids = []
+        self._known_skipped = 0
+        start = 0
+        while len(posting_ids) < job_limit:
+            page = self._get(SEARCH_PATH, {"keywords": role, "location": location, "f_TPR": "r604800",
+                                           "sortBy": "DD", "start": start})
+            if not page.strip():
+                break
+            cards = lxml_html.fromstring(page).xpath(JOB_CARD_XPATH)
+            if not cards:
+                break
+
+            page_ids = {}  # posting key -> posting id
+            for card in cards:
+                found = posting_id(card.get("data-entity-urn", ""))
+                if found is None:
+                    links = card.xpath(JOB_LINK_XPATH)
+                    found = posting_id(links[0].split("?")[0]) if links else None
+                if found is not None:
+                    page_ids.setdefault(posting_key(found), found)
+
+            new_keys = [key for key in self.crawl_state.filter_new(page_ids) if page_ids[key] not in posting_ids]
+            self._known_skipped += len(page_ids) - len(new_keys)
+            posting_ids.extend(page_ids[key] for key in new_keys[:job_limit - len(posting_ids)])
+            if not new_keys:
+                break
+
+            start += SEARCH_PAGE_SIZE
+        return posting_ids
+
+    def fetch_description(self, posting_id):
+        """Description text of one posting, or None if the page has no description."""
+        page = self._get(POSTING_PATH.format(posting_id=posting_id))
+        nodes = lxml_html.fromstring(page).xpath(DESCRIPTION_XPATH)
+        return _element_text(nodes[0]) if nodes else None
+
+    def _fallback(self, role, location, job_limit, output_path, on_job, reason):
+        print(f"HTTP scraping unavailable ({reason}); falling back to Selenium.")
+        if self.fallback_factory is not None:
+            scraper = self.fallback_factory()
+        else:
+            from models.scrapper import LinkedInJobScraper
+            scraper = LinkedInJobScraper(base_url=self.base_url, crawl_state=self.crawl_state)
+        descriptions = scraper.scrape_job_listings(role, location, job_limit, output_path=output_path, on_job=on_job)
+        self.last_stats = dict(scraper.last_stats or {}, backend="selenium")
+        return descriptions
+
+    def scrape_job_listings(self, role, location, job_limit=10, output_path='job_descriptions.jsonl', on_job=None):
+        """
+        Scrapes LinkedIn for job descriptions based on role, location, and job limit.
+        Each new description is appended to the JSONL corpus under its posting key
+        as soon as it is fetched (and passed to `on_job(job_id, description)` if given).
+        """
+        if lxml_html is None:
+            return self._fallback(role, location, job_limit, output_path, on_job, "lxml is not installed")
+
+        started = time.monotonic()
+        try:
+            posting_ids = self.search_postings(role, location, job_limit)
+        except requests.RequestException as e:
+            return self._fallback(role, location, job_limit, output_path, on_job, e)
+        if not posting_ids:
+            if self._known_skipped:
+                print(f"No new postings ({self._known_skipped} already scraped).")
+                self.last_stats = {"backend": "http", "jobs": 0, "urls": 0, "known_skipped": self._known_skipped}
+                return {}
+            return self._fallback(role, location, job_limit, output_path, on_job, "no job cards found")
+
+        job_ids = [posting_key(posting_id) for posting_id in posting_ids]
+        results = {}
+
+        with CorpusWriter(output_path) as writer:
+            def scrape(job_id, posting_id):
+                try:
+                    description = self.fetch_description(posting_id)
+                except Exception as e:
+                    print(f"Error scraping job posting {posting_id}: {e}")
+                    return
+                if not description:
+                    print(f"No description found for job posting {posting_id}")
+                    return
+                results[job_id] = description
+                writer.append(job_id, description)
+                self.crawl_state.mark_scraped(job_id, self.base_url + POSTING_PATH.format(posting_id=posting_id))
+                if on_job is not None:
+                    on_job(job_id, description)
+
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                list(executor.map(scrape, job_ids, posting_ids))
+
+        elapsed = time.monotonic() - started
+        self.last_stats = {
+            "backend": "http",
+            "jobs": len(results),
+            "urls": len(posting_ids),
+            "known_skipped": self._known_skipped,
+            "workers": self.workers,
+            "seconds": round(elapsed, 2),
+            "jobs_per_minute": round(len(results) * 60 / elapsed, 2) if elapsed > 0 else 0.0,
+        }
+        print(f"Scraped {len(results)} jobs in {elapsed:.1f}s ({self.last_stats['jobs_per_minute']} jobs/min)")
+
+        # Same order as the search results
+        return {job_id: results[job_id] for job_id in job_ids if job_id in results}
@@ -1,7 +1,26 @@
-
-import google.generativeai as genai
 import json
 
+from services.gpt_service import DEFAULT_MODEL_NAME, generate_text
+from models.role_classifier import normalize_role
+from services.singleflight import SingleFlight, fingerprint
+
+# Cohorts preparing for the same role at once share one Gemini call;
+# interview_flight.stats() reports the fan-in
+interview_flight = SingleFlight("interview_prep")
+
+
+def _request_interview_prep(prompt):
+    """Call Gemini and parse the JSON array of companies it returns."""
+    response_text = generate_text(prompt).strip()
+
+    # Clean up markdown if present
+    if "```json" in response_text:
+        response_text = response_text.split("```json")[1].split("```")[0].strip()
+    elif "```" in response_text:
+        response_text = response_text.split("```")[1].split("```")[0].strip()
+
+    return json.loads(response_text)
+
 def get_interview_prep_data(role):
     """
     Generates interview preparation data for top companies hiring for the given role.
@@ -30,17 +49,9 @@ def get_interview_prep_data(role):
     """
 
     try:
-        model = genai.GenerativeModel('gemini-1.5-flash')
-        response = model.generate_content(prompt)
-        response_text = response.text.strip()
-        
-        # Clean up markdown if present
-        if "```json" in response_text:
-            response_text = response_text.split("```json")[1].split("```")[0].strip()
-        elif "```" in response_text:
-            response_text = response_text.split("```")[1].split("```")[0].strip()
-            
-        data = json.loads(response_text)
+        # Keyed by the normalized role so 'SDE' and 'sde ' coalesce as well
+        flight_key = fingerprint(DEFAULT_MODEL_NAME, "interview_prep", normalize_role(role))
+        data = interview_flight.do(flight_key, lambda: _request_interview_prep(prompt))
         return data
 
     except Exception as e:
@@ -0,0 +1,346 @@
+import math
+import os
+import threading
+import time
+from collections import Counter, OrderedDict
+
+from models.corpus import corpus_files, iter_records, read_appended
+from models.role_classifier import role_classifier, tokenize_role
+from models.skill_matcher import SkillMatcher
+from models.skill_registry import SKILL_ALIASES, skill_registry
+from models.skill_snapshot import current_snapshot
+from services.singleflight import fingerprint
+
+JOB_DESCRIPTIONS_PATH = os.getenv("JOB_DESCRIPTIONS_PATH", "job_descriptions.json")
+JOB_SKILLS_PATH = os.getenv("JOB_SKILLS_PATH", "job_skills.json")
+
+# Corpus files are checked for new jobs at most this often
+MARKET_STATS_CHECK_SECONDS = float(os.getenv("MARKET_STATS_CHECK_SECONDS", "5"))
+# Memoized role rankings kept (least recently used are dropped first)
+MARKET_STATS_RANKED_MAX = int(os.getenv("MARKET_STATS_RANKED_MAX", "512"))
+
+# A stored role counts as a match for a query role when their token sets
+# overlap at least this much (Jaccard); below that we fall back to the role family
+ROLE_MATCH_MIN_SIMILARITY = 0.5
+
+# Skill names that are also everyday English words; matching them in free-text
+# descriptions ("go", "rest of the team") would inflate their counts
+AMBIGUOUS_SKILL_NAMES = {"go", "rest", "express", "rails", "next", "node", "spring", "swift"}
+
+
+def role_key(role):
+    return " ".join(tokenize_role(role))
+
+
+class MarketStats:
+    """
+    Demand statistics over the scraped job corpus.
+
+    Every job is one document: a role from job_skills.json with its skill
+    list, or a raw description from job_descriptions.json whose skills are
+    found with a SkillMatcher. For each document we update per-role skill
+    counts, global document frequencies and skill co-occurrence counts.
+    Adding a job only touches those counters, so the statistics grow
+    incrementally; TF-IDF weights are derived from them at query time and
+    ranked answers are memoized (LRU, `ranked_max` roles) until the next add_job().
+
+        tfidf(role, skill) = share of the role's postings listing the skill
+                             * (log((1 + N) / (1 + df(skill))) + 1)
+    """
+
+    def __init__(self, registry=skill_registry, ranked_max=MARKET_STATS_RANKED_MAX):
+        self.registry = registry
+        self.ranked_max = ranked_max
+        self.documents = 0
+        self.role_postings = Counter()  # role key -> documents
+        self.role_skills = {}  # role key -> Counter(skill id)
+        self.role_names = {}  # role key -> display name
+        self.document_frequency = Counter()  # skill id -> documents mentioning it
+        self.co_occurrence = {}  # skill id -> Counter(skill id)
+        self._role_tokens = {}  # token -> set of role keys
+        self._seen = set()
+        self._vocabulary = dict.fromkeys(SKILL_ALIASES.values())
+        self._matcher = None
+        self._ranked = OrderedDict()  # role key -> ranking
+        self._lock = threading.Lock()
+
+    def _matcher_locked(self):
+        # Rebuilt lazily, only after new skill names were seen
+        if self._matcher is None:
+            self._matcher = SkillMatcher(
+                name for name in self._vocabulary if name.strip().lower() not in AMBIGUOUS_SKILL_NAMES
+            )
+        return self._matcher
+
+    def add_job(self, role=None, skills=None, description=None, job_id=None):
+        """
+        Add one job posting. Skills come from `skills` when given, otherwise
+        they are matched in `description`. Jobs are deduplicated by `job_id`
+        (a content hash by default). Returns False if the job was already counted.
+        """
+        job_id = job_id or fingerprint(role, skills, description)
+
+        with self._lock:
+            if job_id in self._seen:
+                return False
+            self._seen.add(job_id)
+
+            if skills is None:
+                skills = self._matcher_locked().find_all(description or "")
+            else:
+                new_names = [s for s in skills if str(s).strip() and s not in self._vocabulary]
+                if new_names:
+                    self._vocabulary.update(dict.fromkeys(new_names))
+                    self._matcher = None
+            skill_ids = self.registry.ids(skills)
+
+            self.documents += 1
+            self.document_frequency.update(skill_ids)
+            for skill_id in skill_ids:
+                pairs = self.co_occurrence.setdefault(skill_id, Counter())
+                pairs.update(skill_ids)
+                pairs[skill_id] -= 1
+                if not pairs[skill_id]:
+                    del pairs[skill_id]
+
+            key = role_key(role)
+            if key:
+                self.role_postings[key] += 1
+                self.role_skills.setdefault(key, Counter()).update(skill_ids)
+                self.role_names.setdefault(key, role.strip())
+                for token in key.split():
+                    self._role_tokens.setdefault(token, set()).add(key)
+
+            self._ranked.clear()
+        return True
+
+    def add_skills_data(self, records):
+        """Add job_skills-style (role, {"skills": [...]}) records. Returns the number of new jobs."""
+        added = 0
+        for role, info in records:
+            skills = info.get("skills", [])
+            # Canonical spellings, so a snapshot record and its JSON source count once
+            job_id = fingerprint("skills", role, self.registry.canonicalize(skills))
+            added += self.add_job(info.get("role") or role, skills=skills, job_id=job_id)
+        return added
+
+    def add_descriptions(self, records):
+        """Add job_descriptions-style (job id, text) records. Returns the number of new jobs."""
+        added = 0
+        for _, description in records:
+            added += self.add_job(description=description, job_id=fingerprint("description", description))
+        return added
+
+    def idf(self, skill_id):
+        return math.log((1 + self.documents) / (1 + self.document_frequency[skill_id])) + 1
+
+    def _matching_roles_locked(self, role):
+        key = role_key(role)
+        if key in self.role_skills:
+            return [key]
+
+        tokens = set(key.split())
+        candidates = set()
+        for token in tokens:
+            candidates.update(self._role_tokens.get(token, ()))
+
+        matches = []
+        for candidate in candidates:
+            candidate_tokens = set(candidate.split())
+            similarity = len(tokens & candidate_tokens) / len(tokens | candidate_tokens)
+            if similarity >= ROLE_MATCH_MIN_SIMILARITY:
+                matches.append(candidate)
+        if matches:
+            return sorted(matches)
+
+        # Nothing close by name: use every stored role of the same family
+        family = role_classifier.classify(role)
+        if family is None:
+            return []
+        return sorted(k for k in self.role_skills if role_classifier.classify(self.role_names[k]) == family)
+
+    def _rank_locked(self, role):
+        roles = self._matching_roles_locked(role)
+        postings = sum(self.role_postings[k] for k in roles)
+        counts = Counter()
+        for k in roles:
+            counts.update(self.role_skills[k])
+
+        ranked = [
+            (count / postings * self.idf(skill_id), count, skill_id)
+            for skill_id, count in counts.items()
+        ]
+        ranked.sort(key=lambda item: (-item[0], -item[1], item[2]))
+        return [
+            {
+                "skill": self.registry.name_of(skill_id),
+                "frequency": count,
+                "share": round(count / postings, 4),
+                "tfidf": round(score, 4),
+            }
+            for score, count, skill_id in ranked
+        ]
+
+    def skill_stats(self, role):
+        """Per-skill frequency, share of postings and TF-IDF for a role, best first."""
+        key = role_key(role)
+        with self._lock:
+            ranked = self._ranked.get(key)
+            if ranked is None:
+                ranked = self._ranked[key] = self._rank_locked(role)
+                while len(self._ranked) > self.ranked_max:
+                    self._ranked.popitem(last=False)
+            else:
+                self._ranked.move_to_end(key)
+        return [dict(entry) for entry in ranked]
+
+    def top_skills(self, role, n=20):
+        """The `n` most characteristic skills for a role; empty when the corpus knows nothing about it."""
+        return [entry["skill"] for entry in self.skill_stats(role)[:n]]
+
+    def related_skills(self, skill, n=10):
+        """Skills that most often appear in the same postings as `skill`."""
+        skill_id = self.registry.lookup(skill)
+        with self._lock:
+            pairs = self.co_occurrence.get(skill_id, Counter()).most_common(n)
+        return [{"skill": self.registry.name_of(other), "count": count} for other, count in pairs]
+
+    def stats(self):
+        with self._lock:
+            return {
+                "documents": self.documents,
+                "roles": len(self.role_skills),
+                "skills": len(self.document_frequency),
+                "memoized_roles": len(self._ranked),
+            }
+
+
+_market_stats = MarketStats()
+_file_positions = {}  # file path -> (inode, size, mtime) of legacy files, (inode, byte offset) of JSONL files
+_last_checks = {}  # (descriptions path, skills path) -> time.monotonic() of the last check
+_load_lock = threading.Lock()
+
+
+def _legacy_position(stat):
+    return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+
+def _replaced(path):
+    """
+    True when a file of the corpus at `path` that was already read has been
+    replaced, truncated, rewritten (legacy .json) or folded away since.
+    Files that are new or only grew do not count.
+    """
+    path = os.path.abspath(path)
+    files = corpus_files(path)
+    base = os.path.splitext(path)[0]
+    for file_path in (path, base + ".json", base + ".jsonl"):
+        position = _file_positions.get(file_path)
+        if position is None:
+            continue
+        if file_path not in files:
+            return True
+        try:
+            stat = os.stat(file_path)
+        except FileNotFoundError:
+            return True
+        if file_path.endswith(".jsonl"):
+            if position[0] != stat.st_ino or stat.st_size < position[1]:
+                return True
+        elif position != _legacy_position(stat):
+            return True
+    return False
+
+
+def _snapshot_records(path):
+    """
+    On the first load of a skills corpus, its records from a current skill
+    snapshot (None if there is none). Every corpus file is then marked as read
+    up to its current end, so later loads only read what is appended.
+    """
+    files = corpus_files(os.path.abspath(path))
+    if any(file_path in _file_positions for file_path in files):
+        return None
+    snapshot = current_snapshot(path)
+    if snapshot is None:
+        return None
+
+    for file_path in files:
+        stat = os.stat(file_path)
+        if file_path.endswith(".jsonl"):
+            _file_positions[file_path] = (stat.st_ino, stat.st_size)
+        else:
+            _file_positions[file_path] = _legacy_position(stat)
+    return snapshot.records()
+
+
+def _new_records(path):
+    """
+    Records added to the corpus at `path` since the last call: files not read
+    before are read in full, JSONL files from the byte offset where the
+    previous call stopped. Callers check _replaced() first.
+    """
+    records = []
+    for file_path in corpus_files(os.path.abspath(path)):
+        try:
+            stat = os.stat(file_path)
+        except FileNotFoundError:
+            continue
+
+        if not file_path.endswith(".jsonl"):
+            if file_path not in _file_positions:
+                records.extend(iter_records(file_path))
+                _file_positions[file_path] = _legacy_position(stat)
+            continue
+
+        inode, offset = _file_positions.get(file_path, (stat.st_ino, 0))
+        if stat.st_size == offset:
+            continue
+        appended, offset = read_appended(file_path, offset)
+        records.extend(appended)
+        _file_positions[file_path] = (inode, offset)
+    return records
+
+
+def load_market_stats(descriptions_path=JOB_DESCRIPTIONS_PATH, skills_path=JOB_SKILLS_PATH):
+    """
+    Return the process-wide statistics, first folding in any jobs appended to
+    the corpus files since the last call. Files are checked at most every
+    MARKET_STATS_CHECK_SECONDS and only their new tails are read. When a file
+    was replaced or rewritten instead (e.g. by write_corpus), the statistics
+    are rebuilt from scratch so stale postings do not linger.
+    """
+    global _market_stats
+    paths = (descriptions_path, skills_path)
+    last_check = _last_checks.get(paths)
+    if last_check is not None and time.monotonic() - last_check < MARKET_STATS_CHECK_SECONDS:
+        return _market_stats
+
+    with _load_lock:
+        last_check = _last_checks.get(paths)
+        if last_check is not None and time.monotonic() - last_check < MARKET_STATS_CHECK_SECONDS:
+            return _market_stats
+
+        stats = _market_stats
+        if _replaced(skills_path) or _replaced(descriptions_path):
+            print("Market stats: corpus files were replaced, rebuilding")
+            stats = MarketStats()
+            _file_positions.clear()
+
+        records = _snapshot_records(skills_path)
+        if records is None:
+            records = _new_records(skills_path)
+        if records:
+            added = stats.add_skills_data(records)
+            print(f"Market stats: added {added} jobs from {skills_path}")
+
+        records = _new_records(descriptions_path)
+        if records:
+            added = stats.add_descriptions(records)
+            print(f"Market stats: added {added} jobs from {descriptions_path}")
+
+        # Swapped in only once complete, so readers never see a half-built rebuild
+        _market_stats = stats
+        _last_checks[paths] = time.monotonic()
+
+    return _market_stats
@@ -1,8 +1,8 @@
-
-import google.generativeai as genai
 import json
 import random
 
+from services.gpt_service import generate_text
+
 def get_fallback_questions(role):
     """
     Returns a robust set of 26 technical questions with unique options
@@ -179,10 +179,7 @@ def generate_quiz_questions(role, missing_skills):
     """
 
     try:
-        model = genai.GenerativeModel('gemini-1.5-flash')
-        # Generate content
-        response = model.generate_content(prompt)
-        response_text = response.text.strip()
+        response_text = generate_text(prompt).strip()
         
         # Clean up any markdown code blocks
         if "```json" in response_text:
@@ -238,9 +235,7 @@ def generate_verification_questions(role, skills):
     """
 
     try:
-        model = genai.GenerativeModel('gemini-1.5-flash')
-        response = model.generate_content(prompt)
-        response_text = response.text.strip()
+        response_text = generate_text(prompt).strip()
         
         if "```json" in response_text:
             response_text = response_text.split("```json")[1].split("```")[0].strip()
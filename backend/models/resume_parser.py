@@ -61,13 +61,42 @@
 #             raise ValueError("Error parsing the LLaMA response: " + str(e))
 #     else:
 #         raise ValueError(f"Error from LLaMA API: {response.status_code}, {response.text}")
-import os
-import google.generativeai as genai
-from dotenv import load_dotenv
-
-load_dotenv()
-GOOGLE_API_KEY = os.getenv("Google_api_key")
-genai.configure(api_key=GOOGLE_API_KEY)
+import threading
+
+from models.response_cache import ResponseCache, make_cache_key
+from models.skill_matcher import SkillMatcher
+from models.skill_registry import SKILL_ALIASES, skill_registry
+from services.gpt_service import generate_text
+
+RESUME_MODEL_NAME = 'gemini-1.5-flash'
+
+# Vocabulary for the keyword fallback used when Gemini fails or returns too few skills
+COMMON_SKILLS = [
+    "Python", "Java", "C++", "JavaScript", "TypeScript", "React", "Angular", "Vue", "Node.js", "Express",
+    "Django", "Flask", "Spring Boot", "SQL", "MySQL", "PostgreSQL", "MongoDB", "NoSQL", "Git", "Docker",
+    "Kubernetes", "AWS", "Azure", "GCP", "Linux", "HTML", "CSS", "SASS", "Tailwind", "Bootstrap",
+    "Machine Learning", "Deep Learning", "Data Analysis", "TensorFlow", "PyTorch", "Pandas", "NumPy",
+    "Spark", "Hadoop", "Tableau", "Power BI", "Excel", "Word", "Salesforce", "JIRA", "Agile", "Scrum",
+    "C#", ".NET", "PHP", "Laravel", "Ruby", "Rails", "Go", "Rust", "Swift", "Kotlin", "Flutter",
+    "DevOps", "CI/CD", "Jenkins", "Terraform", "Ansible", "Redis", "Elasticsearch", "Three.js", "WebGL"
+]
+
+skill_registry.register(COMMON_SKILLS)
+
+# Short aliases that are also pieces of other names ("Three.js", "Node.js",
+# "setup.py") or everyday words; matching them alone produces false skills
+AMBIGUOUS_ALIASES = {"js", "ts", "py", "node", "next", "ml", "dl", "kube"}
+
+# The matcher also knows the unambiguous aliases of the common skills
+# ('k8s', 'nodejs', ...); every vocabulary entry maps to its canonical registry ID
+_FALLBACK_VOCABULARY = COMMON_SKILLS + [
+    alias for alias, canonical in SKILL_ALIASES.items()
+    if canonical in COMMON_SKILLS and alias not in AMBIGUOUS_ALIASES
+]
+_FALLBACK_SKILL_IDS = [skill_registry.id_of(name) for name in _FALLBACK_VOCABULARY]
+
+# Built once at import so fallback extraction has no per-call setup cost
+COMMON_SKILL_MATCHER = SkillMatcher(_FALLBACK_VOCABULARY)
 
 # Define a more strict prompt asking for skills, certifications, and years of experience
 # Define a more strict prompt asking for skills, certifications, and years of experience
@@ -91,38 +120,69 @@ Here is the paragraph:
 "{resume_text}"
 """
 
+_resume_cache = None
+_resume_cache_lock = threading.Lock()
+
+
+def get_resume_cache():
+    """Return the process-wide resume response cache, opening it on first use."""
+    global _resume_cache
+    if _resume_cache is None:
+        with _resume_cache_lock:
+            if _resume_cache is None:
+                _resume_cache = ResponseCache()
+    return _resume_cache
+
+
+def get_resume_cache_stats():
+    """Hit/miss/eviction counters for sizing the resume response cache."""
+    return get_resume_cache().stats()
+
+
+def _generate_resume_response(resume_text):
+    """
+    Call Gemini for the raw extraction text, serving repeat uploads from the response cache.
+    Only successful, non-empty responses are cached.
+    """
+    cache = get_resume_cache()
+    cache_key = make_cache_key(resume_text, LLAMA_PROMPT_TEMPLATE, RESUME_MODEL_NAME)
+
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    # Configure safety settings to avoid blocking benign content
+    safety_settings = [
+        {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_NONE"},
+        {"category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "BLOCK_NONE"},
+        {"category": "HARM_CATEGORY_SEXUALLY_EXPLICIT", "threshold": "BLOCK_NONE"},
+        {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_NONE"}
+    ]
+
+    # Blocked or empty responses raise LLMBlockedError inside the client
+    full_response = generate_text(
+        LLAMA_PROMPT_TEMPLATE.format(resume_text=resume_text),
+        model_name=RESUME_MODEL_NAME,
+        safety_settings=safety_settings
+    )
+
+    # Handle case when response is empty or incomplete
+    if not full_response.strip():
+        raise ValueError("Gemini returned an empty text response")
+
+    cache.set(cache_key, full_response)
+    return full_response
+
+
 def extract_resume_with_llama(resume_text):
     """
     Send the resume text to Google Gemini to extract skills, certifications, experience, and education.
+    Repeat uploads of the same resume are answered from the on-disk response cache.
     """
     try:
-        model = genai.GenerativeModel('gemini-1.5-flash')
-        
-        # Configure safety settings to avoid blocking benign content
-        safety_settings = [
-            {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_NONE"},
-            {"category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "BLOCK_NONE"},
-            {"category": "HARM_CATEGORY_SEXUALLY_EXPLICIT", "threshold": "BLOCK_NONE"},
-            {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_NONE"}
-        ]
-
-        response = model.generate_content(
-            LLAMA_PROMPT_TEMPLATE.format(resume_text=resume_text),
-            safety_settings=safety_settings
-        )
-        
-        # Check if response was blocked or incomplete
-        if not response.parts:
-             print(f"Gemini Response Blocked/Empty. Feedback: {response.prompt_feedback}")
-             raise ValueError("Gemini API blocked the response or returned empty.")
-
-        full_response = response.text
+        full_response = _generate_resume_response(resume_text)
         print("Gemini raw response:", full_response)
 
-        # Handle case when response is empty or incomplete
-        if not full_response.strip():
-            raise ValueError("Gemini returned an empty text response")
-
         # Initialize empty fields
         skills, certifications, years_of_experience, education = "", "None", "0", "Not Mentioned"
 
@@ -150,14 +210,14 @@ def extract_resume_with_llama(resume_text):
             education = edu_match.group(1).strip()
 
         # Convert skills and certifications into lists
-        skills_list = [skill.strip() for skill in skills.split(",") if skill.strip()]
+        skills_list = skill_registry.canonicalize(skill.strip() for skill in skills.split(","))
         certifications_list = [cert.strip() for cert in certifications.split(",") if cert.strip().lower() != "none"]
 
         if len(skills_list) < 3:
             print("Gemini returned few skills, using fallback keyword extraction.")
             fallback_skills = fallback_extract_skills(resume_text)
-            # Merge lists, keeping unique
-            skills_list = list(set(skills_list + fallback_skills))
+            # Merge lists, keeping unique canonical skills
+            skills_list = skill_registry.canonicalize(skills_list + fallback_skills)
 
         # Return structured data as a dictionary
         return {
@@ -181,34 +241,9 @@ def extract_resume_with_llama(resume_text):
 
 def fallback_extract_skills(text):
     """
-    Naive regex-based skill extraction for failsafe.
+    Keyword-based skill extraction for failsafe.
+    Uses the prebuilt matcher so the whole vocabulary is found in one pass,
+    then collapses aliases to canonical names via their registry IDs.
     """
-    import re
-    common_skills = [
-        "Python", "Java", "C++", "JavaScript", "TypeScript", "React", "Angular", "Vue", "Node.js", "Express",
-        "Django", "Flask", "Spring Boot", "SQL", "MySQL", "PostgreSQL", "MongoDB", "NoSQL", "Git", "Docker",
-        "Kubernetes", "AWS", "Azure", "GCP", "Linux", "HTML", "CSS", "SASS", "Tailwind", "Bootstrap",
-        "Machine Learning", "Deep Learning", "Data Analysis", "TensorFlow", "PyTorch", "Pandas", "NumPy",
-        "Spark", "Hadoop", "Tableau", "Power BI", "Excel", "Word", "Salesforce", "JIRA", "Agile", "Scrum",
-        "C#", ".NET", "PHP", "Laravel", "Ruby", "Rails", "Go", "Rust", "Swift", "Kotlin", "Flutter",
-        "DevOps", "CI/CD", "Jenkins", "Terraform", "Ansible", "Redis", "Elasticsearch", "Three.js", "WebGL"
-    ]
-    
-    found_skills = []
-    text_lower = text.lower()
-    
-    for skill in common_skills:
-        # Simple word boundary check (roughly)
-        # Escape special chars like C++ or .js
-        escaped_skill = re.escape(skill.lower())
-        pattern = r'\b' + escaped_skill + r'\b'
-        
-        # Handle C++ specially since it has non-word chars at end
-        if "++" in skill or ".js" in skill or "#" in skill:
-             if skill.lower() in text_lower:
-                 found_skills.append(skill)
-        else:
-             if re.search(pattern, text_lower):
-                 found_skills.append(skill)
-                 
-    return found_skills
+    skill_ids = dict.fromkeys(_FALLBACK_SKILL_IDS[position] for position in COMMON_SKILL_MATCHER.find_positions(text))
+    return [skill_registry.name_of(skill_id) for skill_id in skill_ids]
@@ -1,5 +1,7 @@
+import io
 import os
-import tempfile
+import threading
+import zipfile
 
 # Safe imports to prevent startup crashes on Render
 try:
@@ -12,42 +14,119 @@ try:
 except ImportError:
     docx2txt = None
 
-def extract_text_from_pdf(file_storage):
+
+# Budgets for resume extraction. The Gemini prompt only needs the resume body,
+# so long or scanned documents are cut off early instead of fully decoded.
+MAX_RESUME_CHARS = int(os.getenv("RESUME_MAX_CHARS", "20000"))
+MAX_RESUME_PAGES = int(os.getenv("RESUME_MAX_PAGES", "10"))
+MAX_DOCX_UNCOMPRESSED_BYTES = int(os.getenv("DOCX_MAX_UNCOMPRESSED_BYTES", str(20 * 1024 * 1024)))
+
+_stats_lock = threading.Lock()
+_extraction_stats = {"documents": 0, "truncated": 0}
+
+
+def record_extraction(truncated):
+    """Count one extracted document and whether it hit the size budget."""
+    with _stats_lock:
+        _extraction_stats["documents"] += 1
+        if truncated:
+            _extraction_stats["truncated"] += 1
+
+
+def get_extraction_stats():
+    """Return how many documents were extracted and how many hit the size budget."""
+    with _stats_lock:
+        return dict(_extraction_stats)
+
+
+def read_upload_bytes(file_storage):
+    """Read the full upload into memory, rewinding first in case it was already read."""
+    stream = getattr(file_storage, "stream", file_storage)
+    try:
+        stream.seek(0)
+    except (AttributeError, OSError):
+        pass
+    return stream.read()
+
+
+class DocumentError(ValueError):
+    """The upload cannot be turned into text (unsupported, malformed or unreadable)."""
+
+
+class DocumentTooLargeError(DocumentError):
+    """The document is above one of the extraction size limits."""
+
+
+def open_pdf(data):
+    """Open PDF bytes with PyMuPDF; unreadable files raise DocumentError."""
     if fitz is None:
         raise ImportError("PyMuPDF (fitz) is not installed on the server. PDF extraction is unavailable.")
 
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-        file_storage.save(tmp.name)
-        tmp_path = tmp.name
+    try:
+        return fitz.open(stream=data, filetype="pdf")
+    except RuntimeError as e:
+        raise DocumentError(f"Invalid PDF file: {e}")
+
 
-    text = ""
+def iter_pdf_pages(doc, max_pages=None):
+    """Yield the text of each page of an open PDF in order, stopping after `max_pages` pages."""
+    page_count = doc.page_count if max_pages is None else min(doc.page_count, max_pages)
+    for page_number in range(page_count):
+        try:
+            yield doc[page_number].get_text()
+        except RuntimeError as e:
+            raise DocumentError(f"Invalid PDF page {page_number + 1}: {e}")
+
+
+def extract_text_from_pdf_bytes(data):
+    with open_pdf(data) as doc:
+        return "".join(iter_pdf_pages(doc))
+
+
+def check_docx_size(data, max_uncompressed_bytes=MAX_DOCX_UNCOMPRESSED_BYTES):
+    """Reject DOCX archives whose declared uncompressed size exceeds the cap (zip bombs)."""
     try:
-        with fitz.open(tmp_path) as doc:
-            for page in doc:
-                text += page.get_text()
-    finally:
-        if os.path.exists(tmp_path):
-            os.remove(tmp_path)
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            total = sum(info.file_size for info in archive.infolist())
+    except zipfile.BadZipFile:
+        raise DocumentError("Invalid DOCX file")
 
-    return text
+    if total > max_uncompressed_bytes:
+        raise DocumentTooLargeError(f"DOCX expands to {total} bytes, above the {max_uncompressed_bytes} byte limit")
 
 
-def extract_text_from_docx(file_storage):
+def extract_text_from_docx_bytes(data):
     if docx2txt is None:
         raise ImportError("docx2txt is not installed on the server. DOCX extraction is unavailable.")
 
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".docx") as tmp:
-        file_storage.save(tmp.name)
-        tmp_path = tmp.name
+    check_docx_size(data)
 
-    text = ""
+    # A .docx is a zip archive, so docx2txt can read it straight from memory
     try:
-        text = docx2txt.process(tmp_path)
-    finally:
-        if os.path.exists(tmp_path):
-            os.remove(tmp_path)
+        return docx2txt.process(io.BytesIO(data))
+    except (KeyError, zipfile.BadZipFile) as e:
+        raise DocumentError(f"Invalid DOCX file: {e}")
 
-    return text
+
+def extract_text_from_pdf(file_storage):
+    return extract_text_from_pdf_bytes(read_upload_bytes(file_storage))
+
+
+def extract_text_from_docx(file_storage):
+    return extract_text_from_docx_bytes(read_upload_bytes(file_storage))
+
+
+def extract_text_from_bytes(data, filename):
+    filename = filename.lower()
+
+    if filename.endswith(".pdf"):
+        return extract_text_from_pdf_bytes(data)
+    elif filename.endswith(".docx"):
+        return extract_text_from_docx_bytes(data)
+    elif filename.endswith(".txt"):
+        return data.decode("utf-8", errors="ignore")
+    else:
+        raise DocumentError("Unsupported file format")
 
 
 def extract_text(file_storage):
@@ -57,5 +136,52 @@ def extract_text(file_storage):
         return extract_text_from_pdf(file_storage)
     elif filename.endswith(".docx"):
         return extract_text_from_docx(file_storage)
+    elif filename.endswith(".txt"):
+        return read_upload_bytes(file_storage).decode("utf-8", errors="ignore")
     else:
-        raise ValueError("Unsupported file format")
+        raise DocumentError("Unsupported file format")
+
+
+def bound_text(text, max_chars=MAX_RESUME_CHARS, truncated=False):
+    """Cut already-extracted text to the character budget and record the outcome."""
+    if max_chars is not None and len(text) > max_chars:
+        text = text[:max_chars]
+        truncated = True
+
+    record_extraction(truncated)
+    return {"text": text, "truncated": truncated}
+
+
+def extract_bounded_text_from_bytes(data, filename, max_chars=MAX_RESUME_CHARS, max_pages=MAX_RESUME_PAGES):
+    """
+    Extract at most `max_chars` characters (and, for PDFs, `max_pages` pages).
+    Returns a dict with the text and whether the document was truncated.
+    """
+    filename = filename.lower()
+
+    if filename.endswith(".pdf"):
+        pages = []
+        length = 0
+
+        with open_pdf(data) as doc:
+            page_limit_hit = max_pages is not None and doc.page_count > max_pages
+            # Pages are decoded lazily, so nothing past the budget is ever parsed
+            for page_text in iter_pdf_pages(doc, max_pages):
+                pages.append(page_text)
+                length += len(page_text)
+                if max_chars is not None and length > max_chars:
+                    break
+
+        return bound_text("".join(pages), max_chars, truncated=page_limit_hit)
+    elif filename.endswith(".docx"):
+        return bound_text(extract_text_from_docx_bytes(data), max_chars)
+    elif filename.endswith(".txt"):
+        return bound_text(data.decode("utf-8", errors="ignore"), max_chars)
+    else:
+        raise DocumentError("Unsupported file format")
+
+
+def extract_text_bounded(file_storage, max_chars=MAX_RESUME_CHARS, max_pages=MAX_RESUME_PAGES):
+    return extract_bounded_text_from_bytes(
+        read_upload_bytes(file_storage), file_storage.filename, max_chars=max_chars, max_pages=max_pages
+    )
@@ -0,0 +1,175 @@
+import re
+
+# Abbreviations and spelling variants mapped to one canonical role name
+ROLE_ALIASES = {
+    "sde": "software development engineer",
+    "swe": "software engineer",
+    "aiml": "ai & machine learning",
+    "ai/ml": "ai & machine learning",
+    "ai ml": "ai & machine learning",
+    "ai & ml": "ai & machine learning",
+    "ai and ml": "ai & machine learning",
+    "ml": "machine learning",
+    "qa": "quality assurance",
+    "sdet": "software development engineer in test",
+    "dev sec ops": "devsecops",
+    "dev-sec-ops": "devsecops",
+    "sre": "site reliability engineer",
+    "bi": "business intelligence",
+    "fullstack": "full stack",
+    "full-stack": "full stack",
+    "front end": "frontend",
+    "front-end": "frontend",
+    "back end": "backend",
+    "back-end": "backend",
+    "dev": "developer",
+    "engg": "engineer",
+    "sr": "senior",
+    "sr.": "senior",
+    "jr": "junior",
+    "jr.": "junior",
+}
+
+
+def normalize_role(role):
+    """
+    Canonicalize a job role: lowercase, trim, collapse whitespace and expand
+    known abbreviations, so 'SDE', ' sde ' and 'Sde' share one cache entry.
+    """
+    role = " ".join((role or "").lower().split())
+    if role in ROLE_ALIASES:
+        return ROLE_ALIASES[role]
+
+    # Multi-word variants first, then single-token abbreviations
+    for alias, canonical in ROLE_ALIASES.items():
+        if " " in alias and f" {alias} " in f" {role} ":
+            role = f" {role} ".replace(f" {alias} ", f" {canonical} ").strip()
+
+    return " ".join(ROLE_ALIASES.get(token, token) for token in role.split())
+
+
+# Role families used when Gemini is unavailable. Each keyword is matched as a
+# whole token (or token sequence), so 'java' no longer catches 'javascript'
+# and 'ai' no longer catches 'email'. Multi-word keywords score one point per
+# word, which lets 'react native' outrank the single 'react' keyword.
+ROLE_FAMILIES = [
+    {
+        "family": "data",
+        "keywords": ["data", "analyst", "analytics", "business intelligence", "bi", "tableau", "power bi"],
+        "skills": ["Python", "SQL", "Pandas", "Tableau", "PowerBI", "Excel", "R", "BigQuery"],
+    },
+    {
+        "family": "ai_ml",
+        "keywords": ["ai", "ml", "artificial", "artificial intelligence", "machine", "machine learning", "deep",
+                     "deep learning", "neural", "nlp", "computer vision", "llm", "genai"],
+        "skills": ["Python", "TensorFlow", "PyTorch", "Scikit-Learn", "Deep Learning", "NLP", "Pandas", "NumPy",
+                   "Keras", "Model Deployment"],
+    },
+    {
+        "family": "frontend",
+        "keywords": ["frontend", "react", "web", "ui", "angular", "vue", "javascript", "typescript"],
+        "skills": ["React", "JavaScript", "CSS", "HTML", "Redux", "TypeScript", "Tailwind CSS", "Next.js", "Vue.js",
+                   "Webpack"],
+    },
+    {
+        "family": "backend",
+        "keywords": ["backend", "api", "java", "node", "django", "spring", "golang", "microservices"],
+        "skills": ["Node.js", "Python", "Java", "SQL", "Docker", "REST API", "Microservices", "MongoDB", "PostgreSQL",
+                   "Redis"],
+    },
+    {
+        "family": "full_stack",
+        "keywords": ["full stack", "fullstack", "mern", "mean"],
+        "skills": ["React", "Node.js", "TypeScript", "SQL", "NoSQL", "Docker", "AWS", "Git", "Redux", "Express.js"],
+    },
+    {
+        "family": "devops",
+        "keywords": ["devops", "devsecops", "cloud", "aws", "azure", "gcp", "sre", "site reliability", "platform",
+                     "kubernetes"],
+        "skills": ["AWS", "Docker", "Kubernetes", "Terraform", "CI/CD", "Linux", "Python", "Bash", "Azure", "Ansible"],
+    },
+    {
+        "family": "security",
+        "keywords": ["security", "cyber", "cybersecurity", "pentest", "pentester", "penetration", "soc"],
+        "skills": ["Network Security", "Linux", "Python", "Penetration Testing", "Wireshark", "Cryptography",
+                   "Risk Assessment", "SIEM", "Firewalls", "OWASP"],
+    },
+    {
+        "family": "mobile",
+        "keywords": ["mobile", "ios", "android", "flutter", "react native", "swift", "kotlin"],
+        "skills": ["Flutter", "React Native", "Swift", "Kotlin", "Dart", "Firebase", "Mobile UI Design",
+                   "API Integration"],
+    },
+]
+
+# Default to general software engineering skills instead of generic terms
+DEFAULT_ROLE_SKILLS = ["JavaScript", "Python", "SQL", "Git", "Cloud Computing", "Data Structures", "Algorithms",
+                       "Testing", "System Design", "Agile"]
+
+_TOKEN_RE = re.compile(r"[a-z0-9+#]+")
+
+
+def tokenize_role(role):
+    return _TOKEN_RE.findall((role or "").lower())
+
+
+class RoleClassifier:
+    """
+    Token-indexed keyword classifier. The keyword -> family index is built once,
+    and classifying a role is one pass over its tokens and token pairs.
+    """
+
+    def __init__(self, families, default_skills):
+        self.families = families
+        self.default_skills = default_skills
+        self._index = {}  # keyword -> [(family position, weight)]
+        self._max_ngram = 1
+
+        for position, family in enumerate(families):
+            for keyword in family["keywords"]:
+                tokens = tokenize_role(keyword)
+                if not tokens:
+                    continue
+                self._index.setdefault(" ".join(tokens), []).append((position, len(tokens)))
+                self._max_ngram = max(self._max_ngram, len(tokens))
+
+    def scores(self, role):
+        """Return {family position: score} for every family that matched the role."""
+        tokens = tokenize_role(role)
+        scores = {}
+        seen = set()
+
+        for n in range(1, self._max_ngram + 1):
+            for i in range(len(tokens) - n + 1):
+                gram = " ".join(tokens[i:i + n])
+                if gram in seen:
+                    continue
+                seen.add(gram)
+                for position, weight in self._index.get(gram, ()):
+                    scores[position] = scores.get(position, 0) + weight
+
+        return scores
+
+    def classify(self, role):
+        """Return the best-scoring family name, or None if no keyword matched."""
+        scores = self.scores(role)
+        if not scores:
+            return None
+        # Highest score wins; ties go to the family listed first in the table
+        best = min(scores, key=lambda position: (-scores[position], position))
+        return self.families[best]["family"]
+
+    def skills_for(self, role):
+        """Return a copy of the skill set of the best-matching family."""
+        family = self.classify(role)
+        for entry in self.families:
+            if entry["family"] == family:
+                return list(entry["skills"])
+        return list(self.default_skills)
+
+
+role_classifier = RoleClassifier(ROLE_FAMILIES, DEFAULT_ROLE_SKILLS)
+
+
+def fallback_skills_for_role(role):
+    return role_classifier.skills_for(role)
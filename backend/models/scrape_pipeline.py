@@ -0,0 +1,133 @@
+import queue
+import threading
+import time
+
+from models.corpus import CorpusWriter
+from models.ectract_skills import (
+    EXTRACTION_CHECKPOINT_PATH,
+    EXTRACTION_CONCURRENCY,
+    description_hash,
+    extract_resume_with_llama,
+    load_checkpoint,
+    write_checkpoint_record,
+)
+
+# Scraped descriptions waiting for extraction; when it is full the scraper blocks
+PIPELINE_QUEUE_SIZE = 32
+
+_DONE = object()
+
+
+class ScrapePipeline:
+    """
+    Scraper -> bounded queue -> N extraction workers.
+
+    The scraper pushes every description onto the queue as soon as it has it,
+    and extraction workers call the LLM on them concurrently, so scraping and
+    extraction overlap and the wall time tends to max(scrape, extract). When
+    the LLM falls behind the queue fills up and the scraper's workers block
+    until there is room (backpressure). Results are appended to the skills
+    corpus and the extraction checkpoint as they finish, so descriptions that
+    were already extracted in an earlier run are skipped (and not appended to
+    the corpus again). A failing item is counted and never stops its worker.
+    """
+
+    def __init__(self, scraper, extract=extract_resume_with_llama, extract_workers=EXTRACTION_CONCURRENCY,
+                 queue_size=PIPELINE_QUEUE_SIZE, checkpoint_path=EXTRACTION_CHECKPOINT_PATH):
+        self.scraper = scraper
+        self.extract = extract
+        self.extract_workers = max(1, extract_workers)
+        self.queue_size = queue_size
+        self.checkpoint_path = checkpoint_path
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self._stats[name] = self._stats.get(name, 0) + amount
+
+    def _enqueue(self, work, job_id, description):
+        self._count("scraped")
+        if work.full():
+            self._count("producer_blocked")
+        waited = time.monotonic()
+        work.put((job_id, description))
+        self._count("producer_wait_seconds", time.monotonic() - waited)
+
+    def _extract_worker(self, work, done, checkpoint, writer):
+        while True:
+            item = work.get()
+            if item is _DONE:
+                return
+            job_id, description = item
+
+            # A worker that dies would leave the producer blocked on a full queue forever
+            try:
+                self._process(job_id, description, done, checkpoint, writer)
+            except Exception as e:
+                print(f"Error processing {job_id}: {e}")
+                self._count("failed")
+
+    def _process(self, job_id, description, done, checkpoint, writer):
+        content_hash = description_hash(description)
+        with self._lock:
+            checkpointed = content_hash in done
+        if checkpointed:
+            # Checkpointed results are already in the skills corpus
+            self._count("skipped")
+            return
+
+        try:
+            info = self.extract(description)
+        except Exception as e:
+            # Not checkpointed, so process_job_descriptions() retries it later
+            print(f"Error extracting data for {job_id}: {e}")
+            self._count("failed")
+            return
+
+        # Corpus first, then checkpoint: a checkpointed result is always in the corpus
+        writer.append(info.get("role") or f"job_{job_id}", info)
+        with self._lock:
+            done[content_hash] = info
+            write_checkpoint_record(checkpoint, content_hash, job_id, info)
+        self._count("extracted")
+
+    def run(self, role, location, job_limit=10, descriptions_path='job_descriptions.jsonl',
+            skills_path='job_skills.jsonl'):
+        """Scrape and extract in one pass. Returns the pipeline stats."""
+        started = time.monotonic()
+        self._stats = {"scraped": 0, "extracted": 0, "skipped": 0, "failed": 0,
+                       "producer_blocked": 0, "producer_wait_seconds": 0.0}
+        work = queue.Queue(maxsize=self.queue_size)
+        done = load_checkpoint(self.checkpoint_path)
+
+        with CorpusWriter(skills_path) as writer, open(self.checkpoint_path, 'a') as checkpoint:
+            workers = [
+                threading.Thread(target=self._extract_worker, args=(work, done, checkpoint, writer), daemon=True)
+                for _ in range(self.extract_workers)
+            ]
+            for worker in workers:
+                worker.start()
+
+            try:
+                self.scraper.scrape_job_listings(
+                    role, location, job_limit, output_path=descriptions_path,
+                    on_job=lambda job_id, description: self._enqueue(work, job_id, description),
+                )
+            finally:
+                for _ in workers:
+                    work.put(_DONE)
+                for worker in workers:
+                    worker.join()
+
+        stats = dict(self._stats)
+        stats["producer_wait_seconds"] = round(stats["producer_wait_seconds"], 2)
+        stats["seconds"] = round(time.monotonic() - started, 2)
+        stats["scrape_seconds"] = (self.scraper.last_stats or {}).get("seconds")
+        print(f"Pipeline finished: {stats}")
+        return stats
+
+
+def run_scrape_pipeline(scraper, role, location, job_limit=10, **options):
+    """Convenience wrapper: ScrapePipeline(scraper, **options).run(role, location, job_limit)."""
+    return ScrapePipeline(scraper, **options).run(role, location, job_limit)
@@ -366,32 +366,86 @@
 #         self.driver.quit()
 #         return job_descriptions
 
+import queue
 import random
+import threading
 import time
-import os
-import json
+from urllib.parse import quote_plus
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service as ChromeService
-from webdriver_manager.chrome import ChromeDriverManager
+
+from models.browser_pool import BrowserPool, get_browser_pool
+from models.corpus import CorpusWriter
+from models.crawl_state import CrawlState, posting_key
+
+LINKEDIN_BASE_URL = "https://www.linkedin.com"
+
+# Page elements the scraper waits for; a local fixture server only has to use the same classes
+JOB_CARD_CLASS = 'job-card-list__title'
+JOB_DESCRIPTION_CLASS = 'jobs-description-content__text'
+NEXT_PAGE_CLASS = 'artdeco-pagination__button--next'
+SEE_MORE_XPATH = '//button[@aria-label="Click to see more description"]'
+
+# Upper bound for explicit waits on page elements
+PAGE_LOAD_TIMEOUT = 20
+
+class PolitenessBudget:
+    """
+    Per-worker request pacing: at least `min_interval` seconds (plus up to
+    `jitter`) between two page loads of the same worker. Time the worker
+    already spent waiting for the page counts towards the interval.
+    """
+
+    def __init__(self, min_interval=4.0, jitter=2.0):
+        self.min_interval = min_interval
+        self.jitter = jitter
+        self._last_request = None
+
+    def wait(self):
+        if self._last_request is not None:
+            delay = self.min_interval + random.uniform(0, self.jitter) - (time.monotonic() - self._last_request)
+            if delay > 0:
+                time.sleep(delay)
+        self._last_request = time.monotonic()
 
 class LinkedInJobScraper:
-    def __init__(self):
-        """Initialize the scraper with optimized Chrome options."""
-        chrome_options = webdriver.ChromeOptions()
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--disable-extensions")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-        chrome_options.add_argument("--disable-popup-blocking")
-        chrome_options.add_argument("--window-size=1200x800")
-        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-
-        # Start Chrome
-        self.driver = webdriver.Chrome(service=ChromeService(ChromeDriverManager().install()), options=chrome_options)
+    def __init__(self, driver_factory=None, base_url=LINKEDIN_BASE_URL, workers=3,
+                 min_interval=4.0, jitter=2.0, crawl_state=None, browser_pool=None):
+        """
+        Scraper with one listing driver plus `workers` detail-page drivers, all
+        borrowed from a browser pool (the shared warm pool by default).
+        `driver_factory` and `base_url` can point the scraper at a local fixture server.
+        Postings already in `crawl_state` are not fetched again.
+        """
+        if browser_pool is None:
+            browser_pool = BrowserPool(driver_factory) if driver_factory else get_browser_pool()
+        self.browser_pool = browser_pool
+        self._driver = None
+        self.base_url = base_url.rstrip("/")
+        self.workers = max(1, workers)
+        self.min_interval = min_interval
+        self.jitter = jitter
+        self.last_stats = None
+        self.crawl_state = crawl_state or CrawlState()
+
+    @property
+    def driver(self):
+        """The listing browser, borrowed from the pool on first use."""
+        if self._driver is None:
+            self._driver = self.browser_pool.acquire()
+        return self._driver
+
+    def close(self):
+        """Hand the listing browser back to the pool (it stays warm for the next scrape)."""
+        if self._driver is not None:
+            self.browser_pool.release(self._driver)
+            self._driver = None
+
+    def _load(self, driver, url):
+        driver.get(url)
+        self.browser_pool.record_page(driver)
 
     def random_sleep(self, min_time=8, max_time=12):
         """Introduce a random delay to mimic human behavior."""
@@ -412,7 +466,7 @@ class LinkedInJobScraper:
 
     def login(self, email, password):
         """Login to LinkedIn using provided credentials."""
-        self.driver.get('https://www.linkedin.com/login')
+        self.driver.get(f'{self.base_url}/login')
         WebDriverWait(self.driver, 10).until(EC.presence_of_element_located((By.ID, "username"))).send_keys(email)
         self.random_sleep(5, 8)
         self.driver.find_element(By.ID, "password").send_keys(password)
@@ -420,70 +474,149 @@ class LinkedInJobScraper:
         self.driver.find_element(By.XPATH, '//button[@type="submit"]').click()
         self.random_sleep(10, 20)  # Pause after login to avoid immediate requests
 
-    def extract_job_description(self):
+    def extract_job_description(self, driver=None):
         """Extract the full job description, clicking 'See more' if necessary."""
+        driver = driver or self.driver
         try:
-            see_more_button = self.driver.find_element(By.XPATH, '//button[@aria-label="Click to see more description"]')
+            see_more_button = driver.find_element(By.XPATH, SEE_MORE_XPATH)
             if see_more_button:
                 see_more_button.click()
-                self.random_sleep(7, 10)  # Wait for more content to load
         except Exception:
             pass  # 'See more' button might not exist for every job
 
-        # Now grab the full job description
-        description = self.driver.find_element(By.CLASS_NAME, 'jobs-description-content__text').text
+        # Wait for the full job description instead of sleeping a fixed time
+        description = WebDriverWait(driver, PAGE_LOAD_TIMEOUT).until(
+            EC.presence_of_element_located((By.CLASS_NAME, JOB_DESCRIPTION_CLASS))
+        ).text
         return description
 
-    def scrape_job_listings(self, role, location, job_limit=10):
-        """Scrapes LinkedIn for job descriptions based on role, location, and job limit."""
-        job_descriptions = {}
-        base_url = f"https://www.linkedin.com/jobs/search?keywords={role}&location={location}&f_TPR=r604800&f_LF=f_AL&start=0"
-        self.driver.get(base_url)
-        self.random_sleep(16, 20)  # Allow page to fully load
-        total_jobs_scraped = 0
-
-        while total_jobs_scraped < job_limit:
-            jobs = self.driver.find_elements(By.CLASS_NAME, 'job-card-list__title')
-
-            for i, job in enumerate(jobs):
-                if total_jobs_scraped >= job_limit:
-                    break
-                try:
-                    # Simulate human-like mouse movement before clicking
-                    self.simulate_mouse_movement(job)
-                    job.click()
-                    self.random_sleep(7, 10)
-
-                    # Extract job description
-                    description = self.extract_job_description()
-
-                    # Add job description to dictionary
-                    job_descriptions[f"job{total_jobs_scraped + 1}"] = description
-                    total_jobs_scraped += 1
+    def collect_job_urls(self, role, location, job_limit=10):
+        """
+        Walk the search result pages (newest first) and collect up to `job_limit`
+        (posting key, URL) pairs for postings not in the crawl state. Stops at the
+        first page without new postings, since everything after it is older.
+        """
+        search_url = (f"{self.base_url}/jobs/search?keywords={quote_plus(role)}"
+                      f"&location={quote_plus(location)}&f_TPR=r604800&f_LF=f_AL&sortBy=DD&start=0")
+        budget = PolitenessBudget(self.min_interval, self.jitter)
+        budget.wait()
+        self._load(self.driver, search_url)
+
+        job_urls = {}  # posting key -> url
+        self._known_skipped = 0
+        while len(job_urls) < job_limit:
+            try:
+                cards = WebDriverWait(self.driver, PAGE_LOAD_TIMEOUT).until(
+                    EC.presence_of_all_elements_located((By.CLASS_NAME, JOB_CARD_CLASS))
+                )
+            except Exception:
+                break
 
-                except Exception as e:
-                    print(f"Error scraping job description: {e}")
-                    continue
+            page = {}
+            for card in cards:
+                url = card.get_attribute("href")
+                if url:
+                    page.setdefault(posting_key(url), url)
+            new_keys = [key for key in self.crawl_state.filter_new(page) if key not in job_urls]
+            self._known_skipped += len(page) - len(new_keys)
 
-            # Scroll the page randomly to simulate human behavior
-            self.simulate_human_scroll()
+            for key in new_keys[:job_limit - len(job_urls)]:
+                job_urls[key] = page[key]
 
             # Check if there's a next page
             try:
-                next_button = self.driver.find_element(By.CLASS_NAME, 'artdeco-pagination__button--next')
-                if next_button.is_enabled():
-                    # Simulate mouse movement before clicking the next button
-                    self.simulate_mouse_movement(next_button)
-                    next_button.click()
-                    self.random_sleep(8, 12)
-                else:
+                next_button = self.driver.find_element(By.CLASS_NAME, NEXT_PAGE_CLASS)
+                if not next_button.is_enabled() or not new_keys or len(job_urls) >= job_limit:
                     break
+                budget.wait()
+                next_button.click()
+                self.browser_pool.record_page(self.driver)
+                WebDriverWait(self.driver, PAGE_LOAD_TIMEOUT).until(EC.staleness_of(cards[0]))
             except Exception:
                 break
 
-        # Write scraped job descriptions to a JSON file
-        with open('job_descriptions.json', 'w') as f:
-            json.dump(job_descriptions, f, indent=4)
+        return list(job_urls.items())
 
-        self.driver.quit()
-        return job_descriptions
+    def _share_session(self, driver):
+        """Give a worker browser the listing browser's login by copying its cookies."""
+        # Cookies can only be set for the domain the browser is currently on
+        self._load(driver, self.base_url)
+        for cookie in self.driver.get_cookies():
+            try:
+                driver.add_cookie(cookie)
+            except Exception as e:
+                print(f"Could not copy cookie {cookie.get('name')}: {e}")
+
+    def _scrape_worker(self, driver, work, results, writer, on_job):
+        """Drain the shared work queue with one browser, pacing its own page loads."""
+        budget = PolitenessBudget(self.min_interval, self.jitter)
+        while True:
+            try:
+                job_id, url = work.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                budget.wait()
+                self._load(driver, url)
+                description = self.extract_job_description(driver)
+                results[job_id] = description
+                writer.append(job_id, description)
+                self.crawl_state.mark_scraped(job_id, url)
+                if on_job is not None:
+                    # May block when downstream consumers fall behind
+                    on_job(job_id, description)
+            except Exception as e:
+                print(f"Error scraping job description {url}: {e}")
+
+    def scrape_job_listings(self, role, location, job_limit=10, output_path='job_descriptions.jsonl', on_job=None):
+        """
+        Scrapes LinkedIn for job descriptions based on role, location, and job limit.
+        URLs of postings not scraped before are collected first, then `workers`
+        browsers drain them from a shared queue. Each description is appended to
+        the JSONL corpus under its posting key as soon as it is scraped (and passed
+        to `on_job(job_id, description)` if given), and throughput is kept in `last_stats`.
+        """
+        started = time.monotonic()
+        results = {}
+        drivers = [self.driver]
+        try:
+            job_urls = self.collect_job_urls(role, location, job_limit)
+
+            job_ids = [job_id for job_id, _ in job_urls]
+            work = queue.Queue()
+            for item in job_urls:
+                work.put(item)
+
+            threads = []
+            with CorpusWriter(output_path) as writer:
+                try:
+                    for _ in range(min(self.workers, len(job_urls)) - 1):
+                        driver = self.browser_pool.acquire()
+                        drivers.append(driver)
+                        self._share_session(driver)
+                    for driver in drivers:
+                        thread = threading.Thread(target=self._scrape_worker, daemon=True,
+                                                  args=(driver, work, results, writer, on_job))
+                        thread.start()
+                        threads.append(thread)
+                    for thread in threads:
+                        thread.join()
+                finally:
+                    for driver in drivers[1:]:
+                        self.browser_pool.release(driver)
+        finally:
+            self.close()
+
+        elapsed = time.monotonic() - started
+        self.last_stats = {
+            "jobs": len(results),
+            "urls": len(job_urls),
+            "known_skipped": self._known_skipped,
+            "workers": len(drivers),
+            "seconds": round(elapsed, 2),
+            "jobs_per_minute": round(len(results) * 60 / elapsed, 2) if elapsed > 0 else 0.0,
+        }
+        print(f"Scraped {len(results)} jobs in {elapsed:.1f}s ({self.last_stats['jobs_per_minute']} jobs/min)")
+
+        # Same order as the job cards
+        return {job_id: results[job_id] for job_id in job_ids if job_id in results}
@@ -0,0 +1,136 @@
+import os
+import threading
+
+from models.corpus import corpus_signature, load_corpus
+from models.skill_registry import skill_registry
+from models.skill_snapshot import current_snapshot
+
+
+class SkillIndex:
+    """
+    Precomputed index over job_skills.json-style data ({role: {"skills": [...]}}).
+
+    Skills are resolved through the canonical skill registry, so 'SQL' and
+    'sql' (or 'k8s' and 'Kubernetes') share one ID, which is also the skill's
+    bit position. Each role keeps an int bitset of its skills, and each skill
+    keeps a posting list of the roles that need it. Missing skills and role
+    coverage are then bitwise operations instead of nested list scans.
+    """
+
+    def __init__(self, skills_data=None, registry=skill_registry, snapshot=None):
+        """Build from job_skills-style data, or from a SkillSnapshot without decoding its skills."""
+        self.registry = registry
+        self.roles = []
+        self.role_skill_ids = []  # per role: skill ids in their original order
+        self.role_bits = []
+        self.postings = {}  # skill id -> [role positions]
+
+        if snapshot is not None:
+            # Role names stay in the mapping; skills are resolved once per snapshot skill
+            skill_ids = snapshot.skill_ids(registry)
+            self.roles = snapshot.role_names
+            for position in range(snapshot.role_count):
+                self._add_role(position, [skill_ids[i] for i in snapshot.role_skill_positions(position)])
+            return
+
+        for role, info in skills_data.items():
+            skills = [skill for skill in info.get("skills", []) if str(skill).strip()]
+            self._add_role(len(self.roles), [self.registry.id_of(skill) for skill in skills])
+            self.roles.append(role)
+
+    def _add_role(self, position, skill_ids):
+        ids = []
+        bits = 0
+        for skill_id in skill_ids:
+            if bits >> skill_id & 1:
+                continue
+            bits |= 1 << skill_id
+            ids.append(skill_id)
+            self.postings.setdefault(skill_id, []).append(position)
+
+        self.role_skill_ids.append(tuple(ids))
+        self.role_bits.append(bits)
+
+    def skill_bits(self, skills):
+        """Bitset of the given skills; skills unknown to the registry are ignored."""
+        return self.registry.bits(skills)
+
+    def missing_skills(self, position, user_bits):
+        """Skills of the role at `position` that are not in `user_bits`, in the role's order."""
+        return [self.registry.name_of(i) for i in self.role_skill_ids[position] if not user_bits >> i & 1]
+
+    def suggest(self, extracted_skills):
+        """Per-role missing skills for every role the user does not fully cover, in file order."""
+        user_bits = self.skill_bits(extracted_skills)
+        suggestions = []
+
+        for position, role in enumerate(self.roles):
+            if not self.role_bits[position] & ~user_bits:
+                continue
+            missing = self.missing_skills(position, user_bits)
+            suggestions.append({
+                "job": role,
+                "missing_skills": missing,
+                "suggestion": f"To match {role}'s requirements, consider adding skills: {', '.join(missing)}."
+            })
+
+        return suggestions
+
+    def rank_roles(self, extracted_skills, top_k=10):
+        """
+        Best-fit roles by coverage (share of the role's skills the user has).
+        Only roles reachable through the user's skills' posting lists are scored.
+        """
+        user_bits = self.skill_bits(extracted_skills)
+        candidates = set()
+        bits = user_bits
+        while bits:
+            low = bits & -bits
+            candidates.update(self.postings.get(low.bit_length() - 1, ()))
+            bits ^= low
+
+        ranked = []
+        for position in candidates:
+            role_bits = self.role_bits[position]
+            matched = (role_bits & user_bits).bit_count()
+            total = role_bits.bit_count()
+            ranked.append((matched / total, matched, position))
+
+        ranked.sort(key=lambda item: (-item[0], -item[1], item[2]))
+        return [
+            {
+                "job": self.roles[position],
+                "coverage": round(coverage, 4),
+                "matched_count": matched,
+                "missing_skills": self.missing_skills(position, user_bits),
+            }
+            for coverage, matched, position in ranked[:top_k]
+        ]
+
+
+_index_cache = {}
+_index_lock = threading.Lock()
+
+
+def load_skill_index(file_path):
+    """
+    Build the index for a skills corpus file once, rebuilding only when the file changes.
+    A current skill snapshot of the corpus is read instead of the JSON when present.
+    """
+    path = os.path.abspath(file_path)
+    signature = corpus_signature(path)
+
+    with _index_lock:
+        cached = _index_cache.get(path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+    snapshot = current_snapshot(path)
+    if snapshot is not None:
+        index = SkillIndex(snapshot=snapshot)
+    else:
+        index = SkillIndex(load_corpus(path))
+
+    with _index_lock:
+        _index_cache[path] = (signature, index)
+    return index
@@ -0,0 +1,55 @@
+import re
+
+# Word characters for skill matching. Trailing '+' and '#' stay on their word
+# so names like C++ and C# survive, and anything after them starts a new token
+# ("C++11" -> "c++", "11"). Every other symbol ('.', '/', '-') becomes its own
+# token, which lets Node.js, .NET and CI/CD match as token sequences.
+_TOKEN_RE = re.compile(r"[a-z0-9_]+[+#]*|[^\sa-z0-9_]")
+
+
+def tokenize(text):
+    """Split text into lowercase skill-matching tokens."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+class SkillMatcher:
+    """
+    Finds every known skill in a text with one pass over its tokens.
+    The vocabulary is indexed by first token at construction time, so a lookup
+    costs O(tokens) no matter how many skills are registered.
+    """
+
+    def __init__(self, skills):
+        self.skills = list(skills)
+        self._index = {}
+        self._max_len = 1
+
+        for position, skill in enumerate(self.skills):
+            tokens = tuple(tokenize(skill))
+            if not tokens:
+                continue
+            self._index.setdefault(tokens[0], []).append((tokens, position))
+            self._max_len = max(self._max_len, len(tokens))
+
+        # Try longer phrases first so "Spring Boot" is checked before "Spring".
+        for candidates in self._index.values():
+            candidates.sort(key=lambda candidate: len(candidate[0]), reverse=True)
+
+    def find_positions(self, text):
+        """Return the vocabulary positions of all skills present in the text."""
+        tokens = tokenize(text)
+        found = set()
+
+        for i, token in enumerate(tokens):
+            candidates = self._index.get(token)
+            if not candidates:
+                continue
+            for skill_tokens, position in candidates:
+                if len(skill_tokens) == 1 or tuple(tokens[i:i + len(skill_tokens)]) == skill_tokens:
+                    found.add(position)
+
+        return sorted(found)
+
+    def find_all(self, text):
+        """Return the skills present in the text, in vocabulary order."""
+        return [self.skills[position] for position in self.find_positions(text)]
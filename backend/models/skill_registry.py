@@ -0,0 +1,173 @@
+import re
+import threading
+
+# Alternate spellings and abbreviations -> canonical skill name.
+# Keys are compared after skill_key(), so case, spaces, dots and hyphens don't matter.
+SKILL_ALIASES = {
+    "k8s": "Kubernetes",
+    "kube": "Kubernetes",
+    "js": "JavaScript",
+    "ecmascript": "JavaScript",
+    "ts": "TypeScript",
+    "golang": "Go",
+    "py": "Python",
+    "python3": "Python",
+    "cpp": "C++",
+    "c plus plus": "C++",
+    "c sharp": "C#",
+    "csharp": "C#",
+    "dotnet": ".NET",
+    "net core": ".NET",
+    "node": "Node.js",
+    "nodejs": "Node.js",
+    "react.js": "React",
+    "reactjs": "React",
+    "vue.js": "Vue",
+    "vuejs": "Vue",
+    "angularjs": "Angular",
+    "express.js": "Express",
+    "expressjs": "Express",
+    "next": "Next.js",
+    "postgres": "PostgreSQL",
+    "postgre sql": "PostgreSQL",
+    "psql": "PostgreSQL",
+    "mongo": "MongoDB",
+    "ms sql": "SQL Server",
+    "mssql": "SQL Server",
+    "amazon web services": "AWS",
+    "google cloud": "GCP",
+    "google cloud platform": "GCP",
+    "microsoft azure": "Azure",
+    "ml": "Machine Learning",
+    "dl": "Deep Learning",
+    "natural language processing": "NLP",
+    "sklearn": "Scikit-Learn",
+    "scikit learn": "Scikit-Learn",
+    "tensor flow": "TensorFlow",
+    "powerbi": "Power BI",
+    "ms excel": "Excel",
+    "microsoft excel": "Excel",
+    "ci cd": "CI/CD",
+    "cicd": "CI/CD",
+    "rest api": "REST",
+    "restful": "REST",
+    "restful apis": "REST",
+    "ror": "Rails",
+    "ruby on rails": "Rails",
+    "tailwind css": "Tailwind",
+    "tailwindcss": "Tailwind",
+    "html5": "HTML",
+    "css3": "CSS",
+    "elastic search": "Elasticsearch",
+    "gitlab ci": "GitLab",
+    "data analytics": "Data Analysis",
+}
+
+# Characters that never distinguish two skills ("Node.js" == "nodejs", "Power BI" == "powerbi").
+# '+' and '#' are kept so C, C++ and C# stay distinct.
+_KEY_STRIP_RE = re.compile(r"[\s.\-_/]+")
+
+
+def skill_key(name):
+    """Lookup key for a skill name: lowercase with separators removed."""
+    return _KEY_STRIP_RE.sub("", str(name).lower())
+
+
+class SkillRegistry:
+    """
+    Canonical skill vocabulary with compact integer IDs.
+
+    Every spelling resolves through the alias table to one canonical name
+    and ID. IDs are dense, so sets of IDs or int bitmaps (1 << id) can stand
+    in for lists of strings. Only id_of(), register() and ids() intern
+    unknown skills (the first spelling seen becomes the canonical one); they
+    are meant for corpus vocabulary. User input and LLM output go through
+    lookup(), known_ids(), bits(), identity() and canonicalize(), which never
+    grow the registry.
+    """
+
+    def __init__(self, aliases=SKILL_ALIASES, canonical_skills=()):
+        self._names = []  # id -> canonical name
+        self._ids = {}  # skill_key -> id
+        self._lock = threading.Lock()
+
+        for canonical in list(canonical_skills) + sorted(set(aliases.values())):
+            self.id_of(canonical)
+        for alias, canonical in aliases.items():
+            self._ids.setdefault(skill_key(alias), self._ids[skill_key(canonical)])
+
+    def __len__(self):
+        return len(self._names)
+
+    def lookup(self, name):
+        """Return the ID for `name`, or None if it is not registered."""
+        return self._ids.get(skill_key(name))
+
+    def id_of(self, name):
+        """Return the ID for `name`, interning it as a new canonical skill if needed."""
+        key = skill_key(name)
+        skill_id = self._ids.get(key)
+        if skill_id is not None:
+            return skill_id
+
+        with self._lock:
+            skill_id = self._ids.get(key)
+            if skill_id is None:
+                skill_id = len(self._names)
+                self._names.append(str(name).strip())
+                self._ids[key] = skill_id
+        return skill_id
+
+    def register(self, names):
+        """Intern a batch of names; returns their IDs in order."""
+        return [self.id_of(name) for name in names if str(name).strip()]
+
+    def name_of(self, skill_id):
+        return self._names[skill_id]
+
+    def ids(self, names):
+        """Set of IDs for the given corpus names (interning unknown ones)."""
+        return {self.id_of(name) for name in names if str(name).strip()}
+
+    def known_ids(self, names):
+        """Set of IDs for the names already in the registry; unknown names are ignored."""
+        found = set()
+        for name in names:
+            skill_id = self.lookup(name)
+            if skill_id is not None:
+                found.add(skill_id)
+        return found
+
+    def bits(self, names):
+        """Bitmap with bit `id` set for every registered name."""
+        bitmap = 0
+        for skill_id in self.known_ids(names):
+            bitmap |= 1 << skill_id
+        return bitmap
+
+    def identity(self, name):
+        """Comparison key for a name: its ID when registered, otherwise its skill_key()."""
+        key = skill_key(name)
+        skill_id = self._ids.get(key)
+        return key if skill_id is None else skill_id
+
+    def canonicalize(self, names):
+        """
+        Map names to canonical spellings, dropping duplicates and keeping
+        first-seen order. Unknown names keep their own spelling and are not interned.
+        """
+        seen = set()
+        result = []
+        for name in names:
+            name = str(name).strip()
+            if not name:
+                continue
+            identity = self.identity(name)
+            if identity not in seen:
+                seen.add(identity)
+                result.append(name if isinstance(identity, str) else self._names[identity])
+        return result
+
+
+# Process-wide registry shared by all analyzers so IDs agree everywhere
+skill_registry = SkillRegistry()
@@ -0,0 +1,273 @@
+import argparse
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+
+from models.corpus import corpus_files, iter_records
+from models.skill_registry import skill_key, skill_registry
+
+SKILL_SNAPSHOT_PATH = os.getenv("SKILL_SNAPSHOT_PATH", "job_skills.snapshot")
+
+SNAPSHOT_MAGIC = b"SKLSNAP\x00"
+SNAPSHOT_VERSION = 1
+# magic, version, roles, skills, role -> skill entries, role name bytes, skill name bytes
+_HEADER = struct.Struct("<8sIIIIII")
+
+
+def _padded(length):
+    return (length + 3) & ~3
+
+
+class _NameTable:
+    """Read-only sequence over a snapshot string table."""
+
+    def __init__(self, count, name_at):
+        self._count = count
+        self._name_at = name_at
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, position):
+        if not 0 <= position < self._count:
+            raise IndexError(position)
+        return self._name_at(position)
+
+
+class SkillSnapshot:
+    """
+    Read-only, memory-mapped view of a compiled job_skills corpus.
+
+    Layout (little-endian uint32 arrays, 4-byte aligned, after the header):
+        role_name_offsets[roles + 1], skill_name_offsets[skills + 1],
+        indptr[roles + 1], indices[entries], skill_counts[skills],
+        role name bytes, skill name bytes
+
+    Roles are sorted by name and skills by skill_key(), so lookups are a
+    binary search over the string table. Nothing is decoded at open time:
+    every worker maps the same file and shares one page-cache copy.
+    """
+
+    def __init__(self, path=SKILL_SNAPSHOT_PATH):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, roles, skills, entries, role_bytes, skill_bytes = _HEADER.unpack_from(self._mmap, 0)
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+            self._mmap.close()
+            raise ValueError(f"{path} is not a version {SNAPSHOT_VERSION} skill snapshot")
+
+        self.role_count = roles
+        self.skill_count = skills
+        view = memoryview(self._mmap)
+        offset = _HEADER.size
+
+        def take(length):
+            nonlocal offset
+            section = view[offset:offset + length * 4].cast("I")
+            offset += length * 4
+            return section
+
+        self._role_offsets = take(roles + 1)
+        self._skill_offsets = take(skills + 1)
+        self.indptr = take(roles + 1)
+        self.indices = take(entries)
+        self.skill_counts = take(skills)
+        self._role_names = view[offset:offset + role_bytes]
+        offset += _padded(role_bytes)
+        self._skill_names = view[offset:offset + skill_bytes]
+
+    def close(self):
+        for section in (self._role_offsets, self._skill_offsets, self.indptr, self.indices,
+                        self.skill_counts, self._role_names, self._skill_names):
+            section.release()
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def role_name(self, position):
+        return str(self._role_names[self._role_offsets[position]:self._role_offsets[position + 1]], 'utf-8')
+
+    def skill_name(self, position):
+        return str(self._skill_names[self._skill_offsets[position]:self._skill_offsets[position + 1]], 'utf-8')
+
+    def _search(self, count, key_at, key):
+        low, high = 0, count
+        while low < high:
+            middle = (low + high) // 2
+            if key_at(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low if low < count and key_at(low) == key else None
+
+    def role_position(self, role):
+        return self._search(self.role_count, self.role_name, role)
+
+    def skill_position(self, skill):
+        # Resolve aliases first so 'k8s' finds 'Kubernetes'
+        skill_id = skill_registry.lookup(skill)
+        name = skill_registry.name_of(skill_id) if skill_id is not None else skill
+        return self._search(self.skill_count, lambda position: skill_key(self.skill_name(position)), skill_key(name))
+
+    def skills_for(self, role):
+        """Skill names for a role, or [] if the role is not in the snapshot."""
+        position = self.role_position(role)
+        if position is None:
+            return []
+        return [self.skill_name(i) for i in self.indices[self.indptr[position]:self.indptr[position + 1]]]
+
+    def roles_needing(self, skill):
+        """How many roles list `skill`."""
+        position = self.skill_position(skill)
+        return 0 if position is None else self.skill_counts[position]
+
+    def top_skills(self, n=20):
+        """The `n` skills listed by the most roles."""
+        order = sorted(range(self.skill_count), key=lambda position: -self.skill_counts[position])
+        return [(self.skill_name(position), self.skill_counts[position]) for position in order[:n]]
+
+    def roles(self):
+        return [self.role_name(position) for position in range(self.role_count)]
+
+    @property
+    def role_names(self):
+        """Role names decoded on access; indexable like a list."""
+        return _NameTable(self.role_count, self.role_name)
+
+    def role_skill_positions(self, position):
+        """Skill positions of the role at `position`, as a view into the mapped indices."""
+        return self.indices[self.indptr[position]:self.indptr[position + 1]]
+
+    def skill_ids(self, registry=skill_registry):
+        """Registry id of every snapshot skill, by skill position."""
+        return [registry.id_of(self.skill_name(position)) for position in range(self.skill_count)]
+
+    def records(self):
+        """Stream job_skills-style (role, {"skills": [...]}) records without building the whole dict."""
+        for position in range(self.role_count):
+            skills = [self.skill_name(i) for i in self.role_skill_positions(position)]
+            yield self.role_name(position), {"skills": skills}
+
+    def to_skills_data(self):
+        """Expand back to job_skills-style {role: {"skills": [...]}} data."""
+        return {role: {"skills": self.skills_for(role)} for role in self.roles()}
+
+
+def build_snapshot(skills_path, snapshot_path=SKILL_SNAPSHOT_PATH, registry=skill_registry):
+    """
+    Compile a job_skills corpus (JSON or JSONL) into a snapshot file. The file
+    is written next to the target and renamed over it, so workers that still
+    map the old snapshot keep a consistent view. Returns (roles, skills).
+    """
+    role_skills = {}
+    for role, info in iter_records(skills_path):
+        role_skills[role] = registry.canonicalize(info.get("skills", []))
+
+    # One entry per skill_key(): 'sql' and 'SQL' share the first spelling seen
+    spellings = {}
+    for skills in role_skills.values():
+        for skill in skills:
+            spellings.setdefault(skill_key(skill), skill)
+    skill_names = sorted(spellings.values(), key=skill_key)
+    skill_positions = {skill_key(name): position for position, name in enumerate(skill_names)}
+    role_names = sorted(role_skills)
+
+    indptr = array("I", [0])
+    indices = array("I")
+    skill_counts = array("I", [0] * len(skill_names))
+    for role in role_names:
+        row = dict.fromkeys(skill_positions[skill_key(skill)] for skill in role_skills[role])
+        for position in row:
+            indices.append(position)
+            skill_counts[position] += 1
+        indptr.append(len(indices))
+
+    def string_table(names):
+        offsets = array("I", [0])
+        blob = bytearray()
+        for name in names:
+            blob += name.encode('utf-8')
+            offsets.append(len(blob))
+        return offsets, bytes(blob)
+
+    role_offsets, role_blob = string_table(role_names)
+    skill_offsets, skill_blob = string_table(skill_names)
+
+    if sys.byteorder != "little":
+        for section in (role_offsets, skill_offsets, indptr, indices, skill_counts):
+            section.byteswap()
+
+    temp_path = snapshot_path + ".tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(role_names), len(skill_names),
+                             len(indices), len(role_blob), len(skill_blob)))
+        for section in (role_offsets, skill_offsets, indptr, indices, skill_counts):
+            section.tofile(f)
+        f.write(role_blob.ljust(_padded(len(role_blob)), b"\x00"))
+        f.write(skill_blob)
+    os.replace(temp_path, snapshot_path)
+
+    print(f"Wrote {snapshot_path}: {len(role_names)} roles, {len(skill_names)} skills, {len(indices)} entries")
+    return len(role_names), len(skill_names)
+
+
+_snapshot_cache = {}
+_snapshot_lock = threading.Lock()
+
+
+def load_skill_snapshot(path=SKILL_SNAPSHOT_PATH):
+    """Map a snapshot once per process, remapping only after it is rebuilt."""
+    path = os.path.abspath(path)
+    mtime = os.path.getmtime(path)
+
+    with _snapshot_lock:
+        cached = _snapshot_cache.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        # Old mappings are not closed: requests may still be reading them
+        snapshot = SkillSnapshot(path)
+        _snapshot_cache[path] = (mtime, snapshot)
+    return snapshot
+
+
+def snapshot_path_for(skills_path):
+    """Where the snapshot of a corpus lives: job_skills.json -> job_skills.snapshot."""
+    return os.path.splitext(os.path.abspath(skills_path))[0] + ".snapshot"
+
+
+def current_snapshot(skills_path):
+    """
+    The mapped snapshot of the corpus at `skills_path`, or None when callers
+    should parse the corpus instead (no snapshot, or a corpus file is newer).
+    """
+    snapshot_path = snapshot_path_for(skills_path)
+    try:
+        built = os.stat(snapshot_path).st_mtime_ns
+        if any(os.stat(file_path).st_mtime_ns > built for file_path in corpus_files(os.path.abspath(skills_path))):
+            return None
+        return load_skill_snapshot(snapshot_path)
+    except (OSError, ValueError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile job_skills into a memory-mapped snapshot.")
+    parser.add_argument("skills_path", nargs="?", default="job_skills.json",
+                        help="job_skills corpus (.json or .jsonl)")
+    parser.add_argument("-o", "--output", default=SKILL_SNAPSHOT_PATH, help="Snapshot file to write")
+    args = parser.parse_args(argv)
+
+    build_snapshot(args.skills_path, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -215,12 +215,26 @@
 import os
 import re
 from collections import Counter
-import google.generativeai as genai
-from dotenv import load_dotenv
 
-load_dotenv()
-GOOGLE_API_KEY = os.getenv("Google_api_key")
-genai.configure(api_key=GOOGLE_API_KEY)
+from models.market_stats import load_market_stats
+from models.role_classifier import fallback_skills_for_role, normalize_role
+from models.skill_registry import skill_registry
+from models.ttl_cache import TTLCache
+from services.gpt_service import DEFAULT_MODEL_NAME, generate_text
+from services.singleflight import SingleFlight, fingerprint
+
+# Market skills change slowly: serve from memory for a day, then keep serving
+# the old list for another day while a background call refreshes it.
+MARKET_SKILLS_FRESH_SECONDS = int(os.getenv("MARKET_SKILLS_FRESH_SECONDS", str(24 * 3600)))
+MARKET_SKILLS_STALE_SECONDS = int(os.getenv("MARKET_SKILLS_STALE_SECONDS", str(24 * 3600)))
+
+market_skills_cache = TTLCache(MARKET_SKILLS_FRESH_SECONDS, MARKET_SKILLS_STALE_SECONDS)
+
+# When our own corpus already knows this many skills for a role, Gemini is not asked at all
+MARKET_SKILLS_LOCAL_MIN = int(os.getenv("MARKET_SKILLS_LOCAL_MIN", "10"))
+
+# Coalesces identical in-flight prompts; llm_flight.stats() reports the fan-in
+llm_flight = SingleFlight("skills_analyzer")
 
 # List of valid technical skills
 VALID_TECHNICAL_SKILLS = [
@@ -270,33 +284,12 @@ def analyze_skills_with_llama(user_skills, missing_skills):
     """
 
     try:
-        model = genai.GenerativeModel('gemini-1.5-flash')
-        response = model.generate_content(prompt)
-        
-        response_text = response.text
-        print("Gemini Recommendation Response:", response_text)
-
-        response_data = response_text.strip().split("\n")
-        skill_recommendations = []
-
-        for line in response_data:
-            if "Skill:" in line and "Probability:" in line:
-                # Robust parsing for "Skill: Python, Probability: 0.9"
-                try:
-                    parts = line.split(",")
-                    name_part = parts[0].split("Skill:")[1].strip()
-                    prob_part = parts[1].split("Probability:")[1].strip()
-                    
-                    skill_recommendations.append({
-                        "skill": name_part,
-                        "probability": prob_part
-                    })
-                except Exception:
-                    continue
-
-        # Sort by probability score descending
-        skill_recommendations.sort(key=lambda x: str(x['probability']), reverse=True)
-        return skill_recommendations[:5]
+        # Identical prompts in flight at the same time share one Gemini call
+        recommendations = llm_flight.do(fingerprint(DEFAULT_MODEL_NAME, prompt), lambda: _request_recommendations(prompt))
+
+        # Drop anything the user already has under another spelling (e.g. 'k8s' vs 'Kubernetes')
+        user_skill_keys = {skill_registry.identity(skill) for skill in user_skills if str(skill).strip()}
+        return [rec for rec in recommendations if skill_registry.identity(rec["skill"]) not in user_skill_keys]
 
     except Exception as e:
         print(f"Error calling Gemini API: {e}")
@@ -308,22 +301,41 @@ def analyze_skills_with_llama(user_skills, missing_skills):
 
     return skill_counts, missing_skills
 
-def get_market_skills(role):
+def _request_recommendations(prompt):
+    """Call Gemini with a recommendation prompt and parse the 'Skill: ..., Probability: ...' lines."""
+    response_text = generate_text(prompt)
+    print("Gemini Recommendation Response:", response_text)
+
+    response_data = response_text.strip().split("\n")
+    skill_recommendations = []
+
+    for line in response_data:
+        if "Skill:" in line and "Probability:" in line:
+            # Robust parsing for "Skill: Python, Probability: 0.9"
+            try:
+                parts = line.split(",")
+                name_part = parts[0].split("Skill:")[1].strip()
+                prob_part = parts[1].split("Probability:")[1].strip()
+
+                skill_recommendations.append({
+                    "skill": name_part,
+                    "probability": prob_part
+                })
+            except Exception:
+                continue
+
+    # Sort by probability score descending
+    skill_recommendations.sort(key=lambda x: str(x['probability']), reverse=True)
+    return skill_recommendations[:5]
+
+def _fetch_market_skills(role):
     """
-    Asks Gemini to identify the top 20 critical technical skills for a given job role.
-    Returns a list of skills.
+    Asks Gemini to identify the top 20 critical technical skills for a normalized job role.
+    Raises when the model fails or returns too few skills.
     """
-    import random
-    
-    # Add randomness to prompt to prevent caching and encourage diversity
-    variations = [
-        "cutting-edge", "essential", "industry-standard", "highly sought-after"
-    ]
-    adjective = random.choice(variations)
-
     prompt = f"""
     Act as a senior technical recruiter.
-    Identify the top 20 {adjective} technical skills strictly for a "{role}" position in the modern 2024/2025 tech landscape.
+    Identify the top 20 essential technical skills strictly for a "{role}" position in the modern 2024/2025 tech landscape.
     
     Context:
     - If the role is an abbreviation (e.g. 'AIML', 'SDE', 'QA', 'DevSecOps'), expand it to its full meaning (e.g. 'AI & Machine Learning', 'Software Development Engineer') and provide relevant skills.
@@ -336,54 +348,55 @@ def get_market_skills(role):
     
     Respond strictly with a comma-separated list of skills only.
     """
-    
+
+    # Clean up the response
+    skills_text = llm_flight.do(fingerprint(DEFAULT_MODEL_NAME, prompt), lambda: generate_text(prompt)).strip()
+    # Remove any potential "Here are..." text if the model disobeys slightly
+    if ":" in skills_text:
+        skills_text = skills_text.split(":")[-1]
+
+    # Canonical spellings, with duplicates like 'JS' / 'JavaScript' collapsed
+    market_skills = skill_registry.canonicalize(s.strip() for s in skills_text.split(','))
+
+    # Fallback if AI returns empty or garbage
+    if len(market_skills) < 3:
+         raise ValueError("AI returned insufficient skills")
+
+    return market_skills[:20]
+
+
+def local_market_skills(role, n=20):
+    """Top skills for a role from the scraped corpus statistics; empty if unavailable."""
     try:
-        model = genai.GenerativeModel('gemini-1.5-flash')
-        response = model.generate_content(prompt)
-        
-        # Clean up the response
-        skills_text = response.text.strip()
-        # Remove any potential "Here are..." text if the model disobeys slightly
-        if ":" in skills_text:
-            skills_text = skills_text.split(":")[-1]
-            
-        market_skills = [s.strip() for s in skills_text.split(',') if s.strip()]
-        
-        # Fallback if AI returns empty or garbage
-        if len(market_skills) < 3:
-             raise ValueError("AI returned insufficient skills")
-             
-        return market_skills[:20] 
+        return load_market_stats().top_skills(role, n)
+    except Exception as e:
+        print(f"Error reading local market stats: {e}")
+        return []
+
+
+def _merge_skills(primary, extra, limit=20):
+    return skill_registry.canonicalize(list(primary) + list(extra))[:limit]
+
+
+def get_market_skills(role):
+    """
+    Returns the top 20 critical technical skills for a given job role.
+    Skills come from our own job corpus first. Gemini is only asked to fill
+    the list up when the corpus knows fewer than MARKET_SKILLS_LOCAL_MIN
+    skills for the role; those answers come from the market-skills cache keyed
+    by the normalized role, so each role costs at most one call per refresh window.
+    """
+    normalized_role = normalize_role(role)
+    local_skills = local_market_skills(normalized_role)
+    if len(local_skills) >= MARKET_SKILLS_LOCAL_MIN:
+        return local_skills
+
+    try:
+        skills = market_skills_cache.get_or_load(normalized_role, lambda: _fetch_market_skills(normalized_role))
+        # Merging builds a new list, so callers cannot mutate the cached one
+        return _merge_skills(local_skills, skills)
         
     except Exception as e:
         print(f"Error fetching market skills from Gemini: {e}")
-        # Dynamic Fallback based on role keywords if API fails
-        role_lower = role.lower()
-        
-        if "data" in role_lower or "analyst" in role_lower:
-             return ["Python", "SQL", "Pandas", "Tableau", "PowerBI", "Excel", "R", "BigQuery"]
-             
-        elif "ai" in role_lower or "ml" in role_lower or "artificial" in role_lower or "machine" in role_lower or "deep" in role_lower or "neural" in role_lower:
-             return ["Python", "TensorFlow", "PyTorch", "Scikit-Learn", "Deep Learning", "NLP", "Pandas", "NumPy", "Keras", "Model Deployment"]
-             
-        elif "frontend" in role_lower or "react" in role_lower or "web" in role_lower or "ui" in role_lower or "angular" in role_lower or "vue" in role_lower:
-             return ["React", "JavaScript", "CSS", "HTML", "Redux", "TypeScript", "Tailwind CSS", "Next.js", "Vue.js", "Webpack"]
-             
-        elif "backend" in role_lower or "api" in role_lower or "java" in role_lower or "node" in role_lower or "django" in role_lower or "spring" in role_lower:
-             return ["Node.js", "Python", "Java", "SQL", "Docker", "REST API", "Microservices", "MongoDB", "PostgreSQL", "Redis"]
-             
-        elif "full stack" in role_lower or "fullstack" in role_lower or "mern" in role_lower:
-            return ["React", "Node.js", "TypeScript", "SQL", "NoSQL", "Docker", "AWS", "Git", "Redux", "Express.js"]
-            
-        elif "devops" in role_lower or "cloud" in role_lower or "aws" in role_lower or "azure" in role_lower:
-            return ["AWS", "Docker", "Kubernetes", "Terraform", "CI/CD", "Linux", "Python", "Bash", "Azure", "Ansible"]
-            
-        elif "security" in role_lower or "cyber" in role_lower or "pentest" in role_lower:
-            return ["Network Security", "Linux", "Python", "Penetration Testing", "Wireshark", "Cryptography", "Risk Assessment", "SIEM", "Firewalls", "OWASP"]
-            
-        elif "mobile" in role_lower or "ios" in role_lower or "android" in role_lower or "flutter" in role_lower:
-            return ["Flutter", "React Native", "Swift", "Kotlin", "Dart", "Firebase", "Mobile UI Design", "API Integration"]
-            
-        else:
-             # Default to general software engineering skills instead of generic terms
-             return ["JavaScript", "Python", "SQL", "Git", "Cloud Computing", "Data Structures", "Algorithms", "Testing", "System Design", "Agile"]
+        # Keyword classifier fallback if API fails
+        return _merge_skills(local_skills, fallback_skills_for_role(normalized_role))
@@ -0,0 +1,124 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class _Load:
+    """One in-flight load; waiters block on `done` and share its outcome."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.error = None
+
+
+class TTLCache:
+    """
+    In-memory cache with stale-while-revalidate semantics.
+
+    An entry is fresh for `fresh_seconds`; after that it is still served for up
+    to `stale_seconds` more while one background thread reloads it. Misses and
+    fully expired entries are loaded synchronously, with concurrent callers for
+    the same key waiting on a single load; if it fails, they all get its
+    exception instead of repeating it. At most `max_entries` keys are kept.
+    """
+
+    def __init__(self, fresh_seconds, stale_seconds, max_entries=1024):
+        self.fresh_seconds = fresh_seconds
+        self.stale_seconds = stale_seconds
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (stored_at, value)
+        self._loading = {}  # key -> _Load for the in-flight load
+        self._lock = threading.Lock()
+        self._stats = {"fresh_hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0, "load_errors": 0,
+                       "shared_errors": 0}
+
+    def get_or_load(self, key, loader):
+        """Return the cached value for `key`, calling `loader()` when it is missing or stale."""
+        while True:
+            now = time.time()
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    age = now - entry[0]
+                    if age < self.fresh_seconds:
+                        self._entries.move_to_end(key)
+                        self._stats["fresh_hits"] += 1
+                        return entry[1]
+                    if age < self.fresh_seconds + self.stale_seconds:
+                        self._entries.move_to_end(key)
+                        self._stats["stale_hits"] += 1
+                        if key not in self._loading:
+                            load = self._loading[key] = _Load()
+                            self._stats["refreshes"] += 1
+                            threading.Thread(target=self._refresh, args=(key, loader, load), daemon=True).start()
+                        return entry[1]
+
+                load = self._loading.get(key)
+                if load is None:
+                    load = self._loading[key] = _Load()
+                    self._stats["misses"] += 1
+                    break
+
+            # Another caller is already loading this key; share its outcome
+            load.done.wait()
+            if load.error is not None:
+                with self._lock:
+                    self._stats["shared_errors"] += 1
+                raise load.error
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and time.time() - entry[0] < self.fresh_seconds:
+                    return entry[1]
+            # Evicted before we could read it; look again
+
+        try:
+            value = loader()
+        except Exception as e:
+            load.error = e
+            with self._lock:
+                self._stats["load_errors"] += 1
+            raise
+        else:
+            self._store(key, value)
+            return value
+        finally:
+            self._finish_load(key)
+
+    def _refresh(self, key, loader, load):
+        try:
+            self._store(key, loader())
+        except Exception as e:
+            # Keep serving the stale value until it expires
+            print(f"Background refresh failed for {key!r}: {e}")
+            load.error = e
+            with self._lock:
+                self._stats["load_errors"] += 1
+        finally:
+            self._finish_load(key)
+
+    def _store(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.time(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _finish_load(self, key):
+        with self._lock:
+            load = self._loading.pop(key, None)
+        if load is not None:
+            load.done.set()
+
+    def invalidate(self, key=None):
+        """Drop one key, or every key when `key` is None."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._entries)
+        return stats
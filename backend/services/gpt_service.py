@@ -0,0 +1,239 @@
+import asyncio
+import os
+import random
+import threading
+import weakref
+
+from dotenv import load_dotenv
+
+try:
+    import google.generativeai as genai
+except ImportError:
+    genai = None
+
+try:
+    import requests
+except ImportError:
+    requests = None
+
+load_dotenv()
+GOOGLE_API_KEY = os.getenv("Google_api_key")
+if genai is not None:
+    genai.configure(api_key=GOOGLE_API_KEY)
+
+DEFAULT_MODEL_NAME = os.getenv("GEMINI_MODEL", "gemini-1.5-flash")
+LLM_BACKEND = os.getenv("LLM_BACKEND", "gemini")  # gemini | http | fake
+LLM_STUB_URL = os.getenv("LLM_STUB_URL", "http://127.0.0.1:8808/generate")
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "60"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+LLM_RETRY_BASE_DELAY = float(os.getenv("LLM_RETRY_BASE_DELAY", "0.5"))
+
+
+class LLMBlockedError(ValueError):
+    """The model refused the prompt or returned no content; retrying will not help."""
+
+
+def _status_code(error):
+    """HTTP status carried by a requests HTTPError or a google.api_core error, if any."""
+    status = getattr(getattr(error, "response", None), "status_code", None)
+    if status is None:
+        status = getattr(error, "code", None)
+    return status if isinstance(status, int) else None
+
+
+def is_retryable(error):
+    """
+    Only transient failures are retried: timeouts, connection errors, 429 and
+    5xx. Auth errors, other 4xx and bad input fail the same way every time.
+    """
+    if isinstance(error, (asyncio.TimeoutError, ConnectionError)):
+        return True
+    if requests is not None and isinstance(error, (requests.Timeout, requests.ConnectionError)):
+        return True
+    status = _status_code(error)
+    return status is not None and (status == 429 or status >= 500)
+
+
+# --------------------------------------------------
+# BACKENDS
+# --------------------------------------------------
+
+class GeminiBackend:
+    """Google Gemini backend. Model handles are created once per model name and reused."""
+
+    def __init__(self):
+        self._models = {}
+        self._lock = threading.Lock()
+
+    def get_model(self, model_name):
+        if genai is None:
+            raise ImportError("google-generativeai is not installed on the server. Gemini calls are unavailable.")
+
+        model = self._models.get(model_name)
+        if model is None:
+            with self._lock:
+                model = self._models.get(model_name)
+                if model is None:
+                    model = genai.GenerativeModel(model_name)
+                    self._models[model_name] = model
+        return model
+
+    async def generate(self, prompt, model_name, **kwargs):
+        model = self.get_model(model_name)
+        response = await model.generate_content_async(prompt, **kwargs)
+
+        if not response.parts:
+            print(f"Gemini Response Blocked/Empty. Feedback: {response.prompt_feedback}")
+            raise LLMBlockedError("Gemini API blocked the response or returned empty.")
+
+        return response.text
+
+
+class HTTPBackend:
+    """
+    Posts prompts to a local stub server for offline runs and tests.
+    The server receives {"model", "prompt"} and must answer {"text": ...}.
+    """
+
+    def __init__(self, url=LLM_STUB_URL):
+        if requests is None:
+            raise ImportError("requests is not installed; the HTTP LLM backend is unavailable.")
+        self.url = url
+        self._session = requests.Session()
+
+    def _post(self, prompt, model_name):
+        response = self._session.post(self.url, json={"model": model_name, "prompt": prompt}, timeout=LLM_TIMEOUT_SECONDS)
+        response.raise_for_status()
+        return response.json().get("text", "")
+
+    async def generate(self, prompt, model_name, **kwargs):
+        text = await asyncio.to_thread(self._post, prompt, model_name)
+        if not text.strip():
+            raise LLMBlockedError("LLM stub returned an empty response.")
+        return text
+
+
+class FakeBackend:
+    """
+    In-process backend for tests. `responder` is a callable taking
+    (prompt, model_name) or a fixed string; every prompt is recorded.
+    """
+
+    def __init__(self, responder=""):
+        self.responder = responder
+        self.prompts = []
+
+    async def generate(self, prompt, model_name, **kwargs):
+        self.prompts.append(prompt)
+        text = self.responder(prompt, model_name) if callable(self.responder) else self.responder
+        if not text or not text.strip():
+            raise LLMBlockedError("Fake backend returned an empty response.")
+        return text
+
+
+def make_backend(name=LLM_BACKEND):
+    if name == "gemini":
+        return GeminiBackend()
+    elif name == "http":
+        return HTTPBackend()
+    elif name == "fake":
+        return FakeBackend()
+    else:
+        raise ValueError(f"Unknown LLM backend: {name}")
+
+
+# --------------------------------------------------
+# CLIENT
+# --------------------------------------------------
+
+class _LoopThread:
+    """A single background event loop that all sync callers share."""
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="llm-client-loop", daemon=True)
+        self._thread.start()
+
+    def run(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+
+class LLMClient:
+    """
+    Concurrency-limited LLM client with per-call timeouts and retries with
+    full jitter. Use `agenerate` from async code and `generate` from Flask routes.
+    """
+
+    def __init__(self, backend, max_concurrency=LLM_MAX_CONCURRENCY, timeout=LLM_TIMEOUT_SECONDS,
+                 max_retries=LLM_MAX_RETRIES, retry_base_delay=LLM_RETRY_BASE_DELAY):
+        self.backend = backend
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self._semaphores = weakref.WeakKeyDictionary()
+        self._loop_thread = None
+        self._lock = threading.Lock()
+
+    def _semaphore(self):
+        # asyncio primitives belong to one loop, so keep one semaphore per loop
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphores[loop] = semaphore
+        return semaphore
+
+    async def agenerate(self, prompt, model_name=DEFAULT_MODEL_NAME, timeout=None, **kwargs):
+        """Generate text for `prompt`, retrying transient failures (see is_retryable)."""
+        timeout = timeout or self.timeout
+        semaphore = self._semaphore()
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with semaphore:
+                    return await asyncio.wait_for(self.backend.generate(prompt, model_name, **kwargs), timeout)
+            except Exception as e:
+                if attempt >= self.max_retries or not is_retryable(e):
+                    raise
+                delay = random.uniform(0, self.retry_base_delay * (2 ** attempt))
+                print(f"LLM call failed ({e}); retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
+
+    def generate(self, prompt, model_name=DEFAULT_MODEL_NAME, timeout=None, **kwargs):
+        """Blocking facade over `agenerate`, run on the shared background loop."""
+        if self._loop_thread is None:
+            with self._lock:
+                if self._loop_thread is None:
+                    self._loop_thread = _LoopThread()
+        return self._loop_thread.run(self.agenerate(prompt, model_name=model_name, timeout=timeout, **kwargs))
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """Return the process-wide LLM client, building it from LLM_BACKEND on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = LLMClient(make_backend())
+    return _client
+
+
+def set_backend(backend):
+    """Swap the backend of the shared client (e.g. a FakeBackend in tests)."""
+    get_client().backend = backend
+
+
+def generate_text(prompt, model_name=DEFAULT_MODEL_NAME, **kwargs):
+    """Generate text with the shared client from synchronous code."""
+    return get_client().generate(prompt, model_name=model_name, **kwargs)
+
+
+async def agenerate_text(prompt, model_name=DEFAULT_MODEL_NAME, **kwargs):
+    """Generate text with the shared client from async code."""
+    return await get_client().agenerate(prompt, model_name=model_name, **kwargs)
@@ -0,0 +1,135 @@
+import json
+import os
+import threading
+
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+except ImportError:
+    requests = None
+
+OLLAMA_URL = os.getenv("OLLAMA_URL", "http://127.0.0.1:11434")
+OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "llama3.1")
+# How long Ollama keeps the model loaded after a request, so batch runs never pay a reload
+OLLAMA_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+OLLAMA_TIMEOUT_SECONDS = float(os.getenv("OLLAMA_TIMEOUT_SECONDS", "60"))
+OLLAMA_POOL_SIZE = int(os.getenv("OLLAMA_POOL_SIZE", "8"))
+
+
+class OllamaError(ValueError):
+    """Ollama answered with an error status or an error message in the stream."""
+
+
+class RequiredFields:
+    """
+    Early-stop hook for OllamaClient.generate(): returns True once a completed
+    line has been seen for every label, e.g. RequiredFields(["Skills:", "Certifications:"]).
+    """
+
+    def __init__(self, labels):
+        self.labels = list(labels)
+        self._missing = set(self.labels)
+
+    def __call__(self, line):
+        for label in list(self._missing):
+            if label in line:
+                self._missing.discard(label)
+        return not self._missing
+
+
+class OllamaClient:
+    """
+    Streaming client for Ollama's /api/generate.
+
+    One requests.Session with a sized connection pool is shared by all
+    callers, and every request asks Ollama to keep the model loaded.
+    Streamed fragments are collected in a list and joined once at the end.
+    With `stop_when`, every completed output line is passed to the hook,
+    and the stream is closed as soon as it returns True. Closing the
+    connection makes Ollama stop generating, so no tokens are spent on
+    text after the last needed field.
+    """
+
+    def __init__(self, base_url=OLLAMA_URL, model=OLLAMA_MODEL, keep_alive=OLLAMA_KEEP_ALIVE,
+                 timeout=OLLAMA_TIMEOUT_SECONDS, pool_size=OLLAMA_POOL_SIZE):
+        if requests is None:
+            raise ImportError("requests is not installed; the Ollama client is unavailable.")
+        self.url = base_url.rstrip("/") + "/api/generate"
+        self.model = model
+        self.keep_alive = keep_alive
+        self.timeout = timeout
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        self._lock = threading.Lock()
+        self._stats = {"requests": 0, "early_stops": 0, "chunks": 0}
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self._stats[name] += amount
+
+    def generate(self, prompt, model=None, stop_when=None, options=None):
+        """Return the generated text; stops early when `stop_when(line)` returns True."""
+        payload = {"model": model or self.model, "prompt": prompt, "stream": True, "keep_alive": self.keep_alive}
+        if options:
+            payload["options"] = options
+
+        self._count("requests")
+        parts = []
+        line_parts = []  # fragments of the current, not yet finished, output line
+        chunks = 0
+        stopped = False
+
+        with self._session.post(self.url, json=payload, stream=True, timeout=self.timeout) as response:
+            if response.status_code != 200:
+                raise OllamaError(f"Error from LLaMA API: {response.status_code}, {response.text}")
+
+            for raw in response.iter_lines():
+                if not raw:
+                    continue
+                data = json.loads(raw)
+                chunks += 1
+                if "error" in data:
+                    raise OllamaError(f"Error from LLaMA API: {data['error']}")
+
+                piece = data.get("response", "")
+                if piece:
+                    parts.append(piece)
+                    if stop_when is not None:
+                        if "\n" not in piece:
+                            line_parts.append(piece)
+                        else:
+                            first, *rest = piece.split("\n")
+                            line_parts.append(first)
+                            for line in ["".join(line_parts)] + rest[:-1]:
+                                if stop_when(line):
+                                    stopped = True
+                            line_parts = [rest[-1]]
+                            if stopped:
+                                break
+
+                if data.get("done"):
+                    break
+
+        self._count("chunks", chunks)
+        if stopped:
+            self._count("early_stops")
+        return "".join(parts)
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats)
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_ollama_client():
+    """Process-wide Ollama client, so every caller shares one connection pool."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = OllamaClient()
+        return _client
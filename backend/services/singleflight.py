@@ -0,0 +1,92 @@
+import copy
+import hashlib
+import threading
+import weakref
+
+# Every SingleFlight created in this process, for /metrics
+_instances = weakref.WeakSet()
+
+
+def fingerprint(*parts):
+    """Stable key for a call, e.g. fingerprint(model_name, prompt)."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(str(part).encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls. The first caller for a key runs the
+    function; callers arriving while it is in flight wait and receive a deep
+    copy of the same result (or the same exception). Nothing is cached once
+    the call completes.
+    """
+
+    def __init__(self, name="singleflight"):
+        self.name = name
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._stats = {"calls": 0, "executions": 0, "coalesced": 0, "max_fan_in": 0}
+        _instances.add(self)
+
+    def do(self, key, fn):
+        with self._lock:
+            self._stats["calls"] += 1
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self._stats["coalesced"] += 1
+                self._stats["max_fan_in"] = max(self._stats["max_fan_in"], call.waiters + 1)
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self._stats["executions"] += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result)
+
+        # Waiters must always be woken, even on KeyboardInterrupt or cancellation
+        call.error = RuntimeError(f"{self.name}: the leading call was interrupted")
+        try:
+            result = fn()
+            with self._lock:
+                waiters = call.waiters
+            # Waiters copy from a private snapshot so the leader may mutate its own result
+            if waiters:
+                call.result = copy.deepcopy(result)
+            call.error = None
+            return result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    def stats(self):
+        """Fan-in metrics: upstream executions saved = `coalesced`."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["in_flight"] = len(self._calls)
+        stats["name"] = self.name
+        return stats
+
+
+def get_singleflight_stats():
+    """Stats of every live SingleFlight in the process, keyed by name."""
+    return {flight.name: flight.stats() for flight in list(_instances)}
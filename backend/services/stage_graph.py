@@ -0,0 +1,129 @@
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+# Shared by all requests so a fan-out does not pay thread start-up per call
+STAGE_WORKERS = 16
+# Separate, smaller pool for fire-and-forget work, so slow background calls
+# can never take the threads that request stages are waiting for
+BACKGROUND_WORKERS = 4
+# Background tasks waiting for a worker; beyond this new tasks are dropped,
+# since best-effort work queued behind a burst is stale by the time it runs
+BACKGROUND_QUEUE_SIZE = 8
+
+_executor = None
+_background_executor = None
+_executor_lock = threading.Lock()
+_background_slots = threading.BoundedSemaphore(BACKGROUND_WORKERS + BACKGROUND_QUEUE_SIZE)
+_background_stats = {"submitted": 0, "dropped": 0}
+_background_stats_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=STAGE_WORKERS, thread_name_prefix="stage")
+    return _executor
+
+
+def _run_logged(func, args):
+    try:
+        func(*args)
+    except Exception as e:
+        print(f"Background task {getattr(func, '__name__', func)} failed: {e}")
+    finally:
+        _background_slots.release()
+
+
+def _count_background(name):
+    with _background_stats_lock:
+        _background_stats[name] += 1
+
+
+def run_in_background(func, *args):
+    """
+    Run `func(*args)` on the background pool without waiting for it; failures
+    are only logged. When the pool and its queue are full the task is dropped
+    and None is returned instead of a future.
+    """
+    global _background_executor
+    if not _background_slots.acquire(blocking=False):
+        _count_background("dropped")
+        return None
+
+    if _background_executor is None:
+        with _executor_lock:
+            if _background_executor is None:
+                _background_executor = ThreadPoolExecutor(max_workers=BACKGROUND_WORKERS,
+                                                          thread_name_prefix="background")
+    try:
+        future = _background_executor.submit(_run_logged, func, args)
+    except Exception:
+        _background_slots.release()
+        raise
+    _count_background("submitted")
+    return future
+
+
+def get_background_stats():
+    """Background tasks submitted and dropped because the queue was full."""
+    with _background_stats_lock:
+        return dict(_background_stats)
+
+
+def _timed_call(func, kwargs):
+    start = time.perf_counter()
+    try:
+        return func(**kwargs), None, time.perf_counter() - start
+    except Exception as e:
+        return None, e, time.perf_counter() - start
+
+
+def run_stage_graph(stages):
+    """
+    Run a small dependency graph of stages concurrently.
+
+    `stages` maps a stage name to `(func, [dependency names])`. Each func is
+    called with its dependencies' results as keyword arguments, as soon as
+    they are all available. Stages whose dependencies failed are skipped.
+
+    Returns `(results, timings_ms, errors)` keyed by stage name.
+    """
+    for name, (_, deps) in stages.items():
+        unknown = [dep for dep in deps if dep not in stages]
+        if unknown:
+            raise ValueError(f"Stage '{name}' depends on unknown stages: {unknown}")
+
+    executor = _get_executor()
+    results, timings, errors = {}, {}, {}
+    pending = dict(stages)
+    running = {}
+
+    while pending or running:
+        for name, (func, deps) in list(pending.items()):
+            if any(dep in errors for dep in deps):
+                errors[name] = RuntimeError(f"Skipped: dependency of '{name}' failed")
+                del pending[name]
+            elif all(dep in results for dep in deps):
+                kwargs = {dep: results[dep] for dep in deps}
+                running[executor.submit(_timed_call, func, kwargs)] = name
+                del pending[name]
+
+        if not running:
+            if pending:
+                raise ValueError(f"Stage graph has a cycle: {sorted(pending)}")
+            break
+
+        done, _ = wait(running, return_when=FIRST_COMPLETED)
+        for future in done:
+            name = running.pop(future)
+            value, error, elapsed = future.result()
+            timings[name] = round(elapsed * 1000, 2)
+            if error is None:
+                results[name] = value
+            else:
+                errors[name] = error
+
+    return results, timings, errors